@@ -1,38 +1,159 @@
 import os
 import json
-import sqlite3
-from flask import Flask, render_template, request, redirect, url_for, session, send_file, jsonify
+import time
+import zipfile
+from flask import (Flask, render_template, request, redirect, url_for, session, send_file, jsonify,
+                   Response, stream_with_context, g)
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.security import generate_password_hash, check_password_hash
-from resume_parser import extract_text_and_links_from_pdf, ats_extractor, calculate_ats_score
-from mmaker import generate_autocv
+import resume_parser
+import mmaker
+from resume_parser import (extract_text_and_links_from_pdf, ats_extractor, score_parsed_resume,
+                           score_version, config)
+from parse_cache import ParseCache
+from resume_index import ResumeIndex, DEFAULT_LIMIT as SEARCH_LIMIT
+from uploads import UploadRequest, uploaded_file, MAX_UPLOAD_BYTES, MAX_BATCH_UPLOAD_BYTES
+from user_store import UserStore
+from batch_parse import iter_zip_sources, run_batch, completed_from_lines, DEFAULT_CONCURRENCY
+from mmaker import generate_autocv, render_cache, UPLOAD_FOLDER as OUTPUTS_FOLDER
+from build_jobs import build_queue, artifact_store, QueueFullError, DONE, ARTIFACTS_FOLDER
+from artifact_store import ArtifactCollector
+from live_preview import render_changed_sections
+from resume_model import Resume, ResumeValidationError, render_text
+from draft_pdf import render_draft_pdf
+from token_accounting import ledger
+import instrumentation
+from instrumentation import span
 from pathlib import Path
 import logging
-import re  # New: for manual cleaning
-from pylatexenc.latex2text import LatexNodes2Text  # add import at top if needed
 
 # Initialize Flask app
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
-UPLOAD_FOLDER = 'uploads'
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Uploads are streamed into hashing in-memory buffers with these size caps
+app.request_class = UploadRequest
+app.config['MAX_CONTENT_LENGTH'] = config.get('MAX_UPLOAD_BYTES', MAX_UPLOAD_BYTES)
+app.config['UPLOAD_LIMITS'] = {
+    'parser_batch': config.get('MAX_BATCH_UPLOAD_BYTES', MAX_BATCH_UPLOAD_BYTES),
+}
 
 MIME_TYPES = {
     'pdf': 'application/pdf',
     'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
 }
 
+# Parser results keyed by PDF hash, so re-uploads skip Gemini
+parse_cache = ParseCache()
+resume_index = ResumeIndex()
+
+# Longest a status request may block waiting for a build to finish
+MAX_JOB_WAIT = 25
+
+# "x-sendfile" (Apache/lighttpd) or "x-accel" (nginx) lets the front-end server
+# stream artifact downloads; X_ACCEL_PREFIX is the internal location mapped to
+# outputs/artifacts/ in the nginx config
+DOWNLOAD_OFFLOAD = config.get('DOWNLOAD_OFFLOAD', 'none')
+X_ACCEL_PREFIX = config.get('X_ACCEL_PREFIX', '/protected/artifacts/')
+
+# Prunes old artifacts and LaTeX build leftovers in the background; started by
+# the server entry points, not on import
+artifact_collector = ArtifactCollector(artifact_store, OUTPUTS_FOLDER)
+
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 
+instrumentation.registry.describe('resume_http_requests_total', "HTTP requests by endpoint and status.")
+instrumentation.registry.describe('resume_http_request_duration_seconds', "HTTP request latency by endpoint.")
+instrumentation.registry.describe('resume_llm_failures_total', "Gemini calls that failed or returned unusable output.")
+instrumentation.registry.describe('resume_pdflatex_failures_total', "pdflatex runs that exited with an error.")
+instrumentation.registry.describe('resume_llm_retries_total', "Gemini calls retried after a transient error.")
+instrumentation.registry.describe('resume_llm_coalesced_total', "Gemini calls answered by an identical call in flight.")
+instrumentation.registry.describe('resume_llm_rejected_total', "Gemini calls refused by the circuit breaker or deadline.")
+
+def cache_metrics():
+    """Scrape-time samples from the caches, the build queue and the token ledger."""
+    samples = []
+    for cache, stats in (('render', render_cache.stats()), ('parse', parse_cache.stats())):
+        samples += [
+            ('resume_cache_hits_total', 'counter', "Cache lookups that hit.", {'cache': cache}, stats['hits']),
+            ('resume_cache_misses_total', 'counter', "Cache lookups that missed.", {'cache': cache}, stats['misses']),
+            ('resume_cache_evictions_total', 'counter', "Cache entries evicted.", {'cache': cache}, stats['evictions']),
+            ('resume_cache_entries', 'gauge', "Entries currently cached.", {'cache': cache}, stats['entries']),
+        ]
+    samples.append(('resume_build_jobs_pending', 'gauge', "PDF builds queued or running.", {},
+                    build_queue.pending()))
+    for call, totals in ledger.summary().items():
+        samples += [
+            ('resume_llm_calls_total', 'counter', "Gemini calls made.", {'call': call}, totals['calls']),
+            ('resume_llm_tokens_total', 'counter', "Gemini tokens used.",
+             {'call': call, 'direction': 'input'}, totals['input_tokens']),
+            ('resume_llm_tokens_total', 'counter', "Gemini tokens used.",
+             {'call': call, 'direction': 'output'}, totals['output_tokens']),
+        ]
+    samples.append(('resume_index_documents', 'gauge', "Parsed resumes in the search index.", {},
+                    resume_index.count()))
+    llm = resume_parser.llm.stats()
+    samples += [
+        ('resume_llm_concurrency_limit', 'gauge', "Adaptive limit on concurrent Gemini calls.", {},
+         llm['concurrency_limit']),
+        ('resume_llm_in_flight', 'gauge', "Gemini calls in flight.", {}, llm['in_flight']),
+        ('resume_llm_circuit_open', 'gauge', "1 while the Gemini circuit breaker rejects calls.", {},
+         int(llm['circuit_state'] != 'closed')),
+    ]
+    return samples
+
+instrumentation.registry.register_collector(cache_metrics)
+
+@app.before_request
+def start_timing():
+    g.timing_token = instrumentation.start_request()
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def add_server_timing(response):
+    token = g.pop('timing_token', None)
+    if token is None:
+        return response
+    total = time.perf_counter() - g.pop('request_start')
+    spans = instrumentation.finish_request(token)
+    endpoint = request.endpoint or 'unknown'
+    instrumentation.registry.observe('resume_http_request_duration_seconds', total, endpoint=endpoint)
+    instrumentation.registry.incr('resume_http_requests_total', endpoint=endpoint,
+                                  status=response.status_code)
+    response.headers['Server-Timing'] = instrumentation.server_timing(spans, total)
+    return response
+
+def warm_up():
+    """
+    Load what the app otherwise defers to first use (Gemini client, pypdf,
+    compiled templates). Pre-fork servers can call this once in the master
+    so workers start warm, e.g. in gunicorn.conf.py with preload_app = True:
+
+        def on_starting(server):
+            import app
+            app.warm_up()
+    """
+    resume_parser.warm_up()
+    mmaker.warm_up()
+
+@app.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e):
+    logging.warning(f"Rejected upload to {request.endpoint}: {e.description}")
+    if request.endpoint == 'parser':
+        return render_template('parser.html', error="The uploaded file is too large"), 413
+    return jsonify({"error": "Upload too large"}), 413
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(instrumentation.registry.render(),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 # Initialize database
+user_store = UserStore()
+
 def init_db():
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users 
-                 (id INTEGER PRIMARY KEY, username TEXT, password TEXT)''')
-    conn.commit()
-    conn.close()
+    user_store.migrate()
 
 @app.route('/')
 def landing():
@@ -49,12 +170,8 @@ def login():
         password = request.form.get('password', '').strip()
         if not username or not password:
             return render_template('login.html', error="Username and password are required")
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        c.execute("SELECT password FROM users WHERE username = ?", (username,))
-        user = c.fetchone()
-        conn.close()
-        if user and check_password_hash(user[0], password):
+        password_hash = user_store.get_password_hash(username)
+        if password_hash and check_password_hash(password_hash, password):
             session['username'] = username
             logging.info(f"User {username} logged in")
             return redirect(url_for('landing'))
@@ -76,15 +193,9 @@ def signup():
         password = request.form.get('password', '').strip()
         if not username or not password:
             return render_template('signup.html', error="Username and password are required")
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        c.execute("SELECT username FROM users WHERE username = ?", (username,))
-        if c.fetchone():
+        # The unique index makes this check-and-insert atomic
+        if not user_store.create_user(username, generate_password_hash(password)):
             return render_template('signup.html', error="Username already exists")
-        c.execute("INSERT INTO users (username, password) VALUES (?, ?)", 
-                  (username, generate_password_hash(password)))
-        conn.commit()
-        conn.close()
         logging.info(f"User {username} signed up")
         return redirect(url_for('login'))
     return render_template('signup.html')
@@ -104,15 +215,95 @@ def builder():
         return redirect(url_for('login'))
     if request.method == 'POST':
         try:
-            data = json.loads(request.form['data'])
+            resume = Resume.from_form(json.loads(request.form['data']))
             preview = request.form.get('preview', 'false').lower() == 'true'
-            result = generate_autocv(data, preview)
-            return jsonify({'preview': result} if preview else {'download': os.path.basename(result)})
+            if preview:
+                return jsonify({'preview': generate_autocv(resume, preview=True)})
+            if request.form.get('draft', 'false').lower() == 'true':
+                # Fast approximate layout, rendered inline; pdflatex stays for the download
+                with span('draft_render'):
+                    pdf = render_draft_pdf(resume)
+                return Response(pdf, mimetype='application/pdf', headers={
+                    'Content-Disposition': 'inline; filename="resume-draft.pdf"',
+                    'Cache-Control': 'no-store',
+                })
+            # PDF builds run on the worker pool; the client polls the job
+            job = build_queue.submit(resume, owner=session['username'])
+            return jsonify(job_payload(job)), 202
+        except ResumeValidationError as e:
+            return jsonify({'error': str(e)}), 400
+        except QueueFullError as e:
+            logging.warning(f"Builder queue full: {e}")
+            return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
         except Exception as e:
             logging.error(f"Builder error: {e}")
             return jsonify({'error': str(e)}), 500
     return render_template('maker.html')
 
+def job_payload(job):
+    payload = job.to_dict()
+    payload['status_url'] = url_for('builder_job_status', job_id=job.id)
+    if job.status == DONE:
+        payload['result_url'] = url_for('builder_job_result', job_id=job.id)
+    return payload
+
+def get_owned_job(job_id):
+    job = build_queue.get(job_id)
+    if job is None or job.owner != session.get('username'):
+        return None
+    return job
+
+@app.route('/builder/jobs/<job_id>')
+def builder_job_status(job_id):
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    job = get_owned_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    # Optional long-poll: ?wait=<seconds> blocks until the job finishes
+    wait = min(request.args.get('wait', 0, type=float), MAX_JOB_WAIT)
+    if wait > 0:
+        job.wait(wait)
+    return jsonify(job_payload(job))
+
+@app.route('/builder/jobs/<job_id>/result')
+def builder_job_result(job_id):
+    if 'username' not in session:
+        return redirect(url_for('login'))
+    job = get_owned_job(job_id)
+    if job is None:
+        return "Build job not found", 404
+    artifact = artifact_store.get(job.owner, job.sha256) if job.status == DONE else None
+    if artifact is None:
+        return "Resume is not ready yet", 409
+    return send_artifact(artifact)
+
+def send_artifact(artifact, download_name="resume.pdf"):
+    """
+    Send a stored PDF with its content hash as ETag. Werkzeug answers
+    If-None-Match and Range itself; in offload mode only the headers are
+    sent and the front-end server streams the file (and serves ranges).
+    """
+    if DOWNLOAD_OFFLOAD not in ('x-sendfile', 'x-accel'):
+        response = send_file(artifact.path, mimetype=MIME_TYPES['pdf'], as_attachment=True,
+                             download_name=download_name, etag=artifact.sha256,
+                             conditional=True, max_age=0)
+    elif request.if_none_match.contains(artifact.sha256):
+        response = Response(status=304)
+    else:
+        response = Response(mimetype=MIME_TYPES['pdf'])
+        response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+        if DOWNLOAD_OFFLOAD == 'x-accel':
+            relative = Path(artifact.path).relative_to(ARTIFACTS_FOLDER).as_posix()
+            response.headers['X-Accel-Redirect'] = X_ACCEL_PREFIX + relative
+        else:
+            response.headers['X-Sendfile'] = artifact.path
+    response.set_etag(artifact.sha256)
+    # Revalidate every time; a 304 costs no body
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
 @app.route('/parser', methods=['GET', 'POST'])
 def parser():
     if 'username' not in session:
@@ -120,35 +311,108 @@ def parser():
         return redirect(url_for('login'))
     logging.debug("Processing resume parser")
     if request.method == 'POST':
-        if 'resume' not in request.files:
+        with span('upload'):
+            files = request.files  # parses the multipart body into upload buffers
+        if 'resume' not in files:
             return render_template('parser.html', error="No file uploaded")
-        file = request.files['resume']
+        file = files['resume']
         if file.filename == '':
             return render_template('parser.html', error="No file selected")
         if not file.filename.lower().endswith('.pdf'):
             return render_template('parser.html', error="Only PDF files are allowed")
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], 'resume.pdf')
-        file.save(file_path)
-        resume_text, links = extract_text_and_links_from_pdf(file_path)
+        # Hashed while the body streamed in; no copy of the upload is written
+        upload = uploaded_file(file)
+        digest = upload.hexdigest()
+        # Scoring is local unless the user opts in to the Gemini scorer
+        use_llm = bool(request.values.get('llm_score'))
+        version = score_version(use_llm)
+        # ?refresh=1 (or a "refresh" form field) forces a fresh Gemini parse
+        if request.values.get('refresh'):
+            parse_cache.bypass()
+        else:
+            cached = parse_cache.get(digest, version)
+            if cached:
+                extracted_data, score, breakdown = cached
+                logging.debug(f"Parse cache hit for {digest}")
+                resume_index.add(digest, extracted_data, score, owner=session['username'])
+                return render_template('parser.html', data=extracted_data, score=score,
+                                       breakdown=breakdown)
+        resume_text, links = extract_text_and_links_from_pdf(upload.reader())
         if not resume_text:
             return render_template('parser.html', error="Could not extract text from PDF")
-        extracted_data = ats_extractor(resume_text, links)
-        score = calculate_ats_score(resume_text, extracted_data)
-        return render_template('parser.html', data=extracted_data, score=score)
+        with span('extract'):
+            extracted_data = ats_extractor(resume_text, links)
+        score, breakdown, score_fallback = score_parsed_resume(resume_text, extracted_data, use_llm)
+        if 'error' not in extracted_data:
+            # Neither a local fallback score nor a partial (heuristic-only) parse is cached
+            if not score_fallback and not extracted_data.get('partial'):
+                parse_cache.put(digest, version, extracted_data, score, breakdown)
+            resume_index.add(digest, extracted_data, score, owner=session['username'])
+        return render_template('parser.html', data=extracted_data, score=score, breakdown=breakdown,
+                               score_fallback=score_fallback)
     return render_template('parser.html')
 
+@app.route('/parser/batch', methods=['POST'])
+def parser_batch():
+    """
+    Parse a zip archive of PDFs and stream one JSON line per resume. Upload a
+    previous run's output as 'previous' to skip files that already succeeded.
+    """
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    archive = request.files.get('archive')
+    if archive is None or not archive.filename.lower().endswith('.zip'):
+        return jsonify({"error": "Upload a .zip archive as 'archive'"}), 400
+    completed = set()
+    if 'previous' in request.files:
+        lines = request.files['previous'].read().decode('utf-8', 'replace').splitlines()
+        completed.update(completed_from_lines(lines))
+    concurrency = max(1, min(request.values.get('concurrency', DEFAULT_CONCURRENCY, type=int),
+                             DEFAULT_CONCURRENCY * 2))
+    use_llm = bool(request.values.get('llm_score'))
+    # The upload buffer stays open until the streamed response finishes
+    archive_file = uploaded_file(archive).reader()
+    # Checked before streaming: a bad archive would otherwise fail mid-response
+    if not zipfile.is_zipfile(archive_file):
+        return jsonify({"error": "The uploaded archive is not a valid .zip file"}), 400
+    archive_file.seek(0)
+    owner = session['username']
+
+    def generate():
+        for record in run_batch(iter_zip_sources(archive_file), concurrency, completed,
+                                use_llm, parse_cache):
+            if record['status'] == 'ok':
+                resume_index.add(record['sha256'], record['data'], record['score'], owner=owner)
+            yield json.dumps(record) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/search', methods=['POST'])
+def search_resumes():
+    """
+    Rank the user's parsed resumes against a job description (form field or
+    JSON key 'job_description', optional 'limit'), with matched terms.
+    """
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    params = request.get_json(silent=True) or request.form
+    job_description = params.get('job_description') or ''
+    if not isinstance(job_description, str) or not job_description.strip():
+        return jsonify({"error": "job_description is required"}), 400
+    try:
+        limit = int(params.get('limit', SEARCH_LIMIT))
+    except (TypeError, ValueError):
+        return jsonify({"error": "limit must be an integer"}), 400
+    results = resume_index.search(job_description, limit, owner=session['username'])
+    return jsonify({"results": results, "indexed": resume_index.count(session['username'])})
+
 @app.route('/forgot-password', methods=['GET', 'POST'])
 def forgot_password():
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
         if not username:
             return render_template('forgot_password.html', error="Username is required")
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE username = ?", (username,))
-        user = c.fetchone()
-        conn.close()
-        if not user:
+        if not user_store.exists(username):
             return render_template('forgot_password.html', error="User not found")
         # In a real app, send a password reset email with a secure token.
         # For simplicity, redirect to reset password page with username.
@@ -164,50 +428,22 @@ def reset_password():
         new_password = request.form.get('new_password', '').strip()
         if not new_password:
             return render_template('reset_password.html', username=username, error="New password is required")
-        conn = sqlite3.connect('users.db')
-        c = conn.cursor()
-        hashed_password = generate_password_hash(new_password)
-        c.execute("UPDATE users SET password = ? WHERE username = ?", (hashed_password, username))
-        conn.commit()
-        conn.close()
+        user_store.set_password(username, generate_password_hash(new_password))
         logging.info(f"Password reset for user {username}")
         return redirect(url_for('login'))
     return render_template('reset_password.html', username=username)
 
-def manual_clean(latex_str):
-    # Simple manual cleaning similar to maker.js regex logic
-    cleaned = re.sub(r'\\begin\{[^\}]+\}', '', latex_str)
-    cleaned = re.sub(r'\\end\{[^\}]+\}', '', cleaned)
-    cleaned = re.sub(r'\\[a-zA-Z]+\{([^\}]+)\}', r'\1', cleaned)
-    cleaned = re.sub(r'\\[a-zA-Z]+\s?', '', cleaned)
-    cleaned = re.sub(r'[\$\\]', '', cleaned)
-    return cleaned.strip()
-
-def convert_latex_to_plain_text(latex_str):
-    import re
-    try:
-        # Attempt to extract content between \begin{document} and \end{document}
-        match = re.search(r'\\begin\{document\}(.*?)\\end\{document\}', latex_str, re.DOTALL)
-        content = match.group(1) if match else latex_str
-    except Exception as e:
-        logging.error("Error extracting document environment from LaTeX.", exc_info=True)
-        content = latex_str
-    try:
-        return LatexNodes2Text().latex_to_text(content).strip()
-    except Exception as e:
-        logging.error("Error converting LaTeX to plain text using pylatexenc.", exc_info=True)
-        return manual_clean(content)
-
 @app.route('/preview', methods=['POST'])
 def preview():
     if 'username' not in session:
         return jsonify({"error": "Unauthorized"}), 401
     try:
-        data = json.loads(request.form['data'])
-        preview_code = generate_autocv(data, preview=True)
-        logging.debug(f"Generated preview LaTeX code: {preview_code}")
-        plain_preview = convert_latex_to_plain_text(preview_code)
+        resume = Resume.from_form(json.loads(request.form['data']))
+        with span('text_render'):
+            plain_preview = render_text(resume)
         return jsonify({"preview": plain_preview})
+    except ResumeValidationError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logging.error("Error in /preview endpoint.", exc_info=True)
         return jsonify({"error": str(e)}), 500
@@ -217,10 +453,26 @@ def preview_html():
     if 'username' not in session:
         return jsonify({"error": "Unauthorized"}), 401
     try:
-        data = json.loads(request.form['data'])
+        resume = Resume.from_form(json.loads(request.form['data']))
+        if 'fingerprints' in request.form:
+            # Incremental protocol: only send sections the client doesn't have
+            try:
+                known = json.loads(request.form['fingerprints'] or '{}')
+            except ValueError:
+                known = None
+            if not isinstance(known, dict):
+                return jsonify({"error": "fingerprints must be a JSON object"}), 400
+            with span('html_render'):
+                changes = render_changed_sections(resume, known)
+            if changes is None:
+                return '', 304
+            return jsonify(changes)
         # Render HTML preview using a dedicated template
-        html_preview = render_template('preview_resume.html', data=data)
+        with span('html_render'):
+            html_preview = render_template('preview_resume.html', data=resume)
         return jsonify({"preview": html_preview})
+    except ResumeValidationError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logging.error("Error generating HTML preview", exc_info=True)
         return jsonify({"error": str(e)}), 500
@@ -235,24 +487,16 @@ def download(filetype):
         logging.error(f"Invalid file type requested: {filetype}")
         return "Only PDF downloads are supported", 400
     
-    file_path = Path(app.config['UPLOAD_FOLDER']) / 'resume.pdf'
-    logging.info(f"Attempting to download: {file_path}")
-    
-    if not file_path.is_file():
-        logging.error(f"File not found: {file_path}")
+    # Latest build by default; ?sha256= selects an earlier one of the user's PDFs
+    sha256 = request.args.get('sha256')
+    username = session['username']
+    artifact = artifact_store.get(username, sha256) if sha256 else artifact_store.latest(username)
+    if artifact is None:
+        logging.error(f"No resume artifact for {username}")
         return "Resume file not found. Please generate the resume first.", 404
-    
-    try:
-        return send_file(
-            file_path,
-            mimetype=MIME_TYPES.get(filetype, 'application/octet-stream'),
-            as_attachment=True,
-            download_name=f"resume.{filetype}"
-        )
-    except Exception as e:
-        logging.error(f"Error downloading file: {str(e)}")
-        return f"Error downloading file: {str(e)}", 500
+    return send_artifact(artifact, download_name=f"resume.{filetype}")
 
 if __name__ == '__main__':
     init_db()
+    artifact_collector.start()
     app.run(debug=True)
\ No newline at end of file
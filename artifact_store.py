@@ -0,0 +1,185 @@
+import os
+import re
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+# Per-user limits for published PDFs
+MAX_ARTIFACTS_PER_USER = 20
+MAX_ARTIFACT_AGE = 30 * 24 * 3600
+
+# Limits for intermediate LaTeX output (.tex/.aux/.log/.out and stray PDFs)
+MAX_INTERMEDIATE_AGE = 60 * 60
+INTERMEDIATE_QUOTA = 256 * 1024 * 1024
+# Files younger than this may belong to a build in progress and are never collected
+MIN_INTERMEDIATE_AGE = 5 * 60
+GC_INTERVAL = 10 * 60
+
+INTERMEDIATE_PATTERN = re.compile(r'^resume_\d{8}_\d{6}_[0-9a-f]{8}\.(tex|aux|log|out|pdf)$')
+ARTIFACT_PATTERN = re.compile(r'^([0-9a-f]{64})\.pdf$')
+
+Artifact = namedtuple('Artifact', ['owner', 'sha256', 'path', 'size', 'created'])
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Finished PDFs per user, named by content hash: ``<root>/<user>/<sha256>.pdf``.
+
+    Publishing hard-links the file (falling back to a copy across
+    filesystems), so a PDF shared with the render cache costs no extra disk
+    and survives cache eviction. The hash doubles as the download ETag.
+    """
+
+    def __init__(self, root, max_per_user=MAX_ARTIFACTS_PER_USER, max_age=MAX_ARTIFACT_AGE):
+        self.root = Path(root)
+        self.root.mkdir(exist_ok=True, parents=True)
+        self.max_per_user = max_per_user
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+    def _user_dir(self, owner):
+        # Hashed so usernames never become path components
+        return self.root / hashlib.sha256(owner.encode('utf-8')).hexdigest()[:24]
+
+    def _artifact(self, owner, path):
+        stat = path.stat()
+        return Artifact(owner, path.stem, str(path), stat.st_size, stat.st_mtime)
+
+    def publish(self, owner, pdf_path):
+        """Store ``pdf_path`` for ``owner`` and return it as that user's latest Artifact."""
+        sha256 = file_digest(pdf_path)
+        user_dir = self._user_dir(owner)
+        target = user_dir / f"{sha256}.pdf"
+        with self._lock:
+            user_dir.mkdir(exist_ok=True)
+            if not target.exists():
+                staging = user_dir / f".{sha256}.{os.getpid()}.tmp"
+                try:
+                    os.link(pdf_path, staging)
+                except OSError:
+                    shutil.copyfile(pdf_path, staging)
+                os.replace(staging, target)
+            # mtime orders a user's artifacts; re-publishing makes one the latest
+            os.utime(target)
+            self._trim(user_dir)
+        return self._artifact(owner, target)
+
+    def _entries(self, user_dir):
+        """(mtime, path) of a user's artifacts, newest first."""
+        found = []
+        for entry in os.scandir(user_dir):
+            if ARTIFACT_PATTERN.match(entry.name) and entry.is_file():
+                found.append((entry.stat().st_mtime, Path(entry.path)))
+        return sorted(found, reverse=True)
+
+    def _trim(self, user_dir, now=None):
+        cutoff = (now or time.time()) - self.max_age
+        removed = 0
+        for index, (mtime, path) in enumerate(self._entries(user_dir)):
+            if index >= self.max_per_user or mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def get(self, owner, sha256):
+        if not re.fullmatch(r'[0-9a-f]{64}', sha256 or ''):
+            return None
+        path = self._user_dir(owner) / f"{sha256}.pdf"
+        return self._artifact(owner, path) if path.is_file() else None
+
+    def latest(self, owner):
+        user_dir = self._user_dir(owner)
+        if not user_dir.is_dir():
+            return None
+        entries = self._entries(user_dir)
+        return self._artifact(owner, entries[0][1]) if entries else None
+
+    def prune(self, now=None):
+        """Apply the age and per-user limits to every user; returns files removed."""
+        removed = 0
+        with self._lock:
+            for entry in os.scandir(self.root):
+                if entry.is_dir():
+                    removed += self._trim(Path(entry.path), now)
+        return removed
+
+
+def collect_intermediates(directory, max_age=MAX_INTERMEDIATE_AGE, quota=INTERMEDIATE_QUOTA,
+                          min_age=MIN_INTERMEDIATE_AGE, now=None):
+    """
+    Delete build leftovers in ``directory`` (and its job subdirectories):
+    anything older than ``max_age``, then the oldest files until the rest fit
+    in ``quota`` bytes. Cached PDFs and published artifacts do not match
+    INTERMEDIATE_PATTERN and are left alone. Returns (files, bytes) removed.
+    """
+    now = now or time.time()
+    directory = Path(directory)
+    candidates = []
+    for path in [directory] + [p for p in (directory / 'jobs').glob('*') if p.is_dir()]:
+        for entry in os.scandir(path):
+            if INTERMEDIATE_PATTERN.match(entry.name) and entry.is_file():
+                stat = entry.stat()
+                candidates.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+    candidates.sort()
+
+    removed_files = removed_bytes = 0
+    total = sum(size for _, size, _ in candidates)
+    for mtime, size, path in candidates:
+        age = now - mtime
+        if age < min_age:
+            break
+        if age > max_age or total > quota:
+            path.unlink(missing_ok=True)
+            total -= size
+            removed_files += 1
+            removed_bytes += size
+    # Job directories are emptied above or by the build queue; drop stale empty ones
+    for path in (directory / 'jobs').glob('*'):
+        if path.is_dir() and now - path.stat().st_mtime > max_age and not any(path.iterdir()):
+            path.rmdir()
+    if removed_files:
+        logging.info(f"Collected {removed_files} intermediate files ({removed_bytes} bytes)")
+    return removed_files, removed_bytes
+
+
+class ArtifactCollector:
+    """Daemon thread that periodically prunes artifacts and build leftovers."""
+
+    def __init__(self, store, outputs_dir, interval=GC_INTERVAL):
+        self.store = store
+        self.outputs_dir = outputs_dir
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        try:
+            self.store.prune()
+            collect_intermediates(self.outputs_dir)
+        except Exception as e:
+            logging.error(f"Artifact collection failed: {e}")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def start(self):
+        if self._thread is None:
+            self.run_once()
+            self._thread = threading.Thread(target=self._loop, name='artifact-gc', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,150 @@
+"""
+ASGI entry point: the Flask app, plus a native asyncio parser endpoint.
+
+    uvicorn asgi:application
+
+POST /api/parse with the raw PDF as the request body (optionally
+?llm_score=1 and/or ?refresh=1) returns the parse result as JSON. The
+Gemini calls are awaited, so one worker process holds many parses in
+flight instead of one per thread. Every other path is served by the Flask
+app through asgiref's WSGI adapter. Requests use the Flask session cookie.
+"""
+import json
+import time
+import logging
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+import instrumentation
+from app import app as flask_app, parse_cache, resume_index, artifact_collector, init_db
+from resume_parser import config
+from uploads import MAX_UPLOAD_BYTES
+from async_parser import parse_resume_async
+
+PARSE_PATH = '/api/parse'
+# Same cap as /parser uploads (MAX_UPLOAD_BYTES in config.yaml)
+MAX_BODY_BYTES = config.get('MAX_UPLOAD_BYTES', MAX_UPLOAD_BYTES)
+# Parses beyond this are refused with 503 rather than queued without bound
+MAX_IN_FLIGHT = 64
+
+wsgi_application = WsgiToAsgi(flask_app)
+_in_flight = 0
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+def session_user(scope):
+    """Username from the Flask session cookie, or None."""
+    cookie = SimpleCookie()
+    for name, value in scope.get('headers', ()):
+        if name == b'cookie':
+            cookie.load(value.decode('latin-1'))
+    morsel = cookie.get(flask_app.config['SESSION_COOKIE_NAME'])
+    if morsel is None:
+        return None
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    try:
+        session = serializer.loads(
+            morsel.value, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+    except Exception:
+        return None
+    return session.get('username')
+
+
+async def read_body(receive, limit=MAX_BODY_BYTES):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > limit:
+            raise RequestTooLarge()
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())] + list(headers),
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def parse_endpoint(scope, receive, send):
+    global _in_flight
+    if scope['method'] != 'POST':
+        return await send_json(send, 405, {'error': 'Use POST'}, [(b'allow', b'POST')])
+    user = session_user(scope)
+    if user is None:
+        return await send_json(send, 401, {'error': 'Unauthorized'})
+    if _in_flight >= MAX_IN_FLIGHT:
+        return await send_json(send, 503, {'error': 'Too many parses in flight'},
+                               [(b'retry-after', b'5')])
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    # Counted from before the body is read, so slow uploads hold a slot too
+    _in_flight += 1
+    try:
+        try:
+            pdf_bytes = await read_body(receive)
+        except RequestTooLarge:
+            return await send_json(send, 413, {'error': 'PDF too large'})
+        if pdf_bytes is None:
+            return
+        if not pdf_bytes.startswith(b'%PDF'):
+            return await send_json(send, 400, {'error': 'Request body must be a PDF'})
+
+        token = instrumentation.start_request()
+        start = time.perf_counter()
+        try:
+            result = await parse_resume_async(pdf_bytes, parse_cache,
+                                              use_llm=bool(query.get('llm_score')),
+                                              refresh=bool(query.get('refresh')),
+                                              index=resume_index, owner=user)
+            status = 503 if 'retry_after' in result else 422 if 'error' in result else 200
+        except Exception as e:
+            logging.error("Async parse failed", exc_info=True)
+            result, status = {'error': str(e)}, 500
+        finally:
+            total = time.perf_counter() - start
+            spans = instrumentation.finish_request(token)
+    finally:
+        _in_flight -= 1
+    instrumentation.registry.observe('resume_http_request_duration_seconds', total,
+                                     endpoint='api_parse')
+    instrumentation.registry.incr('resume_http_requests_total', endpoint='api_parse', status=status)
+    headers = [(b'server-timing', instrumentation.server_timing(spans, total).encode('latin-1'))]
+    if 'retry_after' in result:
+        headers.append((b'retry-after', str(result['retry_after']).encode()))
+    await send_json(send, status, result, headers)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            init_db()
+            artifact_collector.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            artifact_collector.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] == 'http' and scope['path'] == PARSE_PATH:
+        return await parse_endpoint(scope, receive, send)
+    return await wsgi_application(scope, receive, send)
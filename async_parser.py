@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from parse_cache import pdf_digest
+from resume_parser import (extract_text_and_links_from_pdf_async, ats_extractor_async,
+                           score_parsed_resume_async, score_version)
+
+
+async def parse_resume_async(pdf_bytes, cache=None, use_llm=False, refresh=False, index=None,
+                             owner=''):
+    """
+    Async version of the /parser pipeline for one PDF: cache lookup, text
+    extraction on a worker thread, then awaited Gemini calls, so a single
+    event loop can keep many parses in flight.
+
+    Returns a dict with sha256 and cached, plus data, score, breakdown and
+    score_fallback (True when the Gemini scorer failed and the local score
+    is shown), or error, and retry_after when Gemini is unavailable. Fallback
+    scores and partial (heuristic-only) parses are not cached. Successful
+    parses are added to ``index`` (a ResumeIndex) under ``owner``.
+    """
+    digest = pdf_digest(pdf_bytes)
+    version = score_version(use_llm)
+    result = {'sha256': digest, 'cached': False}
+    if cache is not None:
+        if refresh:
+            cache.bypass()
+        else:
+            cached = await asyncio.to_thread(cache.get, digest, version)
+            if cached:
+                data, score, breakdown = cached
+                if index is not None:
+                    await asyncio.to_thread(index.add, digest, data, score, owner)
+                return dict(result, cached=True, data=data, score=score, breakdown=breakdown)
+
+    resume_text, links = await extract_text_and_links_from_pdf_async(pdf_bytes)
+    if not resume_text:
+        return dict(result, error="Could not extract text from PDF")
+    extracted_data = await ats_extractor_async(resume_text, links)
+    if 'retry_after' in extracted_data:
+        # Gemini is unavailable; report it rather than an empty parse
+        return dict(result, error=extracted_data['error'], retry_after=extracted_data['retry_after'])
+    score, breakdown, score_fallback = await score_parsed_resume_async(
+        resume_text, extracted_data, use_llm)
+    if (cache is not None and 'error' not in extracted_data and not score_fallback
+            and not extracted_data.get('partial')):
+        await asyncio.to_thread(cache.put, digest, version, extracted_data, score, breakdown)
+    if index is not None and 'error' not in extracted_data:
+        await asyncio.to_thread(index.add, digest, extracted_data, score, owner)
+    logging.debug(f"Async parse of {digest} done")
+    return dict(result, data=extracted_data, score=score, breakdown=breakdown,
+                score_fallback=score_fallback)
@@ -0,0 +1,194 @@
+import re
+import json
+import hashlib
+from functools import lru_cache
+
+# Bump whenever the scoring rules change. Weights, targets and vocabularies are
+# hashed into the version (see scoring_version), so cached scores are not reused.
+SCORING_RULES = 'local-2'
+
+# Maximum points per factor; they add up to 100
+WEIGHTS = {
+    'sections': 25,
+    'completeness': 15,
+    'quantified_achievements': 20,
+    'keywords': 25,
+    'links': 15,
+}
+
+# Quantified bullets and distinct skill keywords needed for full marks
+TARGET_QUANTIFIED = 5
+TARGET_KEYWORDS = 15
+
+DEFAULT_SKILL_VOCABULARIES = {
+    'languages': ['python', 'java', 'javascript', 'typescript', 'c', 'c++', 'c#', 'go',
+                  'rust', 'ruby', 'php', 'kotlin', 'swift', 'scala', 'sql', 'bash'],
+    'web': ['html', 'css', 'react', 'angular', 'vue', 'node.js', 'django', 'flask',
+            'fastapi', 'spring', 'rest', 'graphql', 'next.js'],
+    'data': ['pandas', 'numpy', 'spark', 'hadoop', 'tableau', 'power bi', 'excel',
+             'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn',
+             'nlp', 'computer vision', 'statistics', 'data analysis'],
+    'infrastructure': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'linux',
+                       'ci/cd', 'jenkins', 'git', 'postgresql', 'mysql', 'mongodb', 'redis',
+                       'kafka', 'microservices'],
+    'soft': ['leadership', 'communication', 'teamwork', 'mentoring', 'problem solving',
+             'agile', 'scrum', 'stakeholder management'],
+}
+
+# Skill names that are also ordinary words ("go", "the rest of", "excel at").
+# They only count as a whole entry of the parsed skill lists, or in one of
+# these qualified forms anywhere in the text.
+AMBIGUOUS_TERMS = {
+    'c': ['ansi c', 'embedded c', 'c programming', 'c language'],
+    'go': ['golang'],
+    'rest': ['rest api', 'rest apis', 'restful'],
+    'excel': ['microsoft excel', 'ms excel', 'excel vba'],
+    'spring': ['spring boot', 'spring framework', 'spring mvc'],
+}
+
+SECTION_CHECKS = {
+    'full_name': lambda d: _personal_info(d).get('full_name'),
+    'email': lambda d: _personal_info(d).get('email_id'),
+    'phone': lambda d: _personal_info(d).get('phone'),
+    'summary': lambda d: d.get('professional_summary'),
+    'employment': lambda d: d.get('employment_details'),
+    'education': lambda d: d.get('education'),
+    'skills': lambda d: d.get('technical_skills') or d.get('soft_skills'),
+    'projects': lambda d: d.get('projects'),
+}
+
+# Percentages, multipliers, money and counts of 10+; years (1900-2099) are not metrics
+QUANTIFIED_PATTERN = re.compile(
+    r'\d+(?:[.,]\d+)?\s*(?:%|percent|x\b|k\b|m\b|\+)|[$€£₹]\s?\d|\b(?!(?:19|20)\d\d\b)\d{2,}\b',
+    re.IGNORECASE)
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+', re.IGNORECASE)
+
+
+def scoring_version(vocabularies=None):
+    """Version of scores made with ``vocabularies``; parse results are cached under it."""
+    settings = {'weights': WEIGHTS, 'targets': [TARGET_QUANTIFIED, TARGET_KEYWORDS],
+                'vocabularies': vocabularies or DEFAULT_SKILL_VOCABULARIES,
+                'ambiguous': AMBIGUOUS_TERMS}
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return f"{SCORING_RULES}-{digest}"
+
+
+def _strings(value):
+    """Flatten a model field (string, list, nested lists or dicts) into a list of strings."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return [str(value)]
+    return [text for item in value for text in _strings(item)]
+
+
+def _records(value):
+    """The dict entries of a list field such as employment_details."""
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _personal_info(data):
+    info = data.get('personal_info')
+    return info if isinstance(info, dict) else {}
+
+
+@lru_cache(maxsize=16)
+def _keyword_pattern(terms):
+    # Longest first so "c++" wins over "c"; boundaries allow symbols like + and #
+    alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf'(?<![\w+#.])({alternation})(?![\w+#])', re.IGNORECASE)
+
+
+def _score_sections(data):
+    present = {name: bool(check(data)) for name, check in SECTION_CHECKS.items()}
+    fraction = sum(present.values()) / len(present)
+    return fraction, {'present': [k for k, v in present.items() if v],
+                      'missing': [k for k, v in present.items() if not v]}
+
+
+def _score_completeness(data):
+    fields = []
+    for job in _records(data.get('employment_details')):
+        fields += [job.get('company'), job.get('title'), job.get('duration'),
+                   job.get('responsibilities') or job.get('achievements')]
+    for edu in _records(data.get('education')):
+        fields += [edu.get('degree'), edu.get('institution'), edu.get('year')]
+    for project in _records(data.get('projects')):
+        fields += [project.get('name'), project.get('description')]
+    if not fields:
+        return 0.0, {'filled_fields': 0, 'total_fields': 0}
+    filled = sum(1 for value in fields if value)
+    return filled / len(fields), {'filled_fields': filled, 'total_fields': len(fields)}
+
+
+def _score_quantified(data):
+    bullets = []
+    for job in _records(data.get('employment_details')):
+        bullets += _strings(job.get('responsibilities')) + _strings(job.get('achievements'))
+    bullets += [' '.join(_strings(p.get('description'))) for p in _records(data.get('projects'))]
+    quantified = sum(1 for bullet in bullets if bullet and QUANTIFIED_PATTERN.search(bullet))
+    return min(quantified / TARGET_QUANTIFIED, 1.0), {'quantified': quantified,
+                                                      'bullets': len(bullets)}
+
+
+def _score_keywords(data, resume_text, vocabularies):
+    terms = tuple(sorted({term.lower() for group in vocabularies.values() for term in group}))
+    if not terms:
+        return 0.0, {'matched': [], 'density': 0.0}
+    skills = _strings(data.get('technical_skills')) + _strings(data.get('soft_skills'))
+    text = f"{resume_text or ''}\n{' '.join(skills)}"
+    plain = tuple(term for term in terms if term not in AMBIGUOUS_TERMS)
+    matches = [m.group(1).lower() for m in _keyword_pattern(plain).finditer(text)] if plain else []
+    listed = {skill.strip().lower() for skill in skills}
+    for term in terms:
+        if term in AMBIGUOUS_TERMS:
+            found = len(_keyword_pattern(tuple(AMBIGUOUS_TERMS[term])).findall(text)) + (term in listed)
+            matches += [term] * found
+    matched = sorted(set(matches))
+    words = max(len(text.split()), 1)
+    by_group = {group: sorted(set(matched) & {t.lower() for t in group_terms})
+                for group, group_terms in vocabularies.items()}
+    details = {'matched': matched, 'by_vocabulary': {g: t for g, t in by_group.items() if t},
+               'density': round(len(matches) / words, 4)}
+    return min(len(matched) / TARGET_KEYWORDS, 1.0), details
+
+
+def _score_links(data, resume_text):
+    info = _personal_info(data)
+    links = _strings(data.get('extracted_links')) + URL_PATTERN.findall(resume_text or '')
+    joined = ' '.join(links).lower()
+    has_github = bool(info.get('github_portfolio')) or 'github.com' in joined
+    has_linkedin = bool(info.get('linkedin_id')) or 'linkedin.com' in joined
+    has_project_link = any(p.get('link') for p in _records(data.get('projects')))
+    checks = {'github_or_portfolio': has_github, 'linkedin': has_linkedin,
+              'project_links': has_project_link}
+    fraction = (0.45 * has_github) + (0.35 * has_linkedin) + (0.2 * has_project_link)
+    return fraction, checks
+
+
+def score_resume(extracted_data, resume_text, vocabularies=None):
+    """
+    Deterministic ATS score for parsed resume data.
+
+    Returns {'score': int, 'version': str, 'breakdown': {factor: {...}}}, where
+    each factor reports the points earned, its maximum and what was found.
+    """
+    data = extracted_data if isinstance(extracted_data, dict) and 'error' not in extracted_data else {}
+    vocabularies = vocabularies or DEFAULT_SKILL_VOCABULARIES
+    factors = {
+        'sections': _score_sections(data),
+        'completeness': _score_completeness(data),
+        'quantified_achievements': _score_quantified(data),
+        'keywords': _score_keywords(data, resume_text, vocabularies),
+        'links': _score_links(data, resume_text),
+    }
+    breakdown = {}
+    for name, (fraction, details) in factors.items():
+        breakdown[name] = {'score': round(fraction * WEIGHTS[name], 1),
+                           'max': WEIGHTS[name], 'details': details}
+    total = round(sum(factor['score'] for factor in breakdown.values()))
+    return {'score': int(total), 'version': scoring_version(vocabularies), 'breakdown': breakdown}
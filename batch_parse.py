@@ -0,0 +1,192 @@
+"""
+Bulk resume parsing.
+
+Parses every PDF in a directory or zip archive on a bounded thread pool and
+writes one JSON line per file, in completion order, with status, timings and
+errors. Re-running with the same output file skips files that already have
+a successful result.
+
+    python batch_parse.py resumes.zip -o results.jsonl --concurrency 8
+"""
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+from resume_parser import (extract_text_and_links_from_pdf, ats_extractor, score_parsed_resume,
+                           score_version)
+from parse_cache import ParseCache, pdf_digest
+
+DEFAULT_CONCURRENCY = 4
+MAX_BATCH_FILES = 1000
+MAX_FILE_BYTES = 20 * 1024 * 1024
+
+
+def iter_directory_sources(directory):
+    """Yield (name, loader) for every PDF below ``directory``."""
+    directory = Path(directory)
+    for path in sorted(directory.rglob('*')):
+        if path.is_file() and path.suffix.lower() == '.pdf':
+            yield str(path.relative_to(directory)), path.read_bytes
+
+
+def iter_zip_sources(archive):
+    """Yield (name, loader) for every PDF in a zip archive (path or file object)."""
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.lower().endswith('.pdf'):
+                continue
+            if os.path.basename(info.filename).startswith('._'):
+                continue  # macOS resource forks
+            if info.file_size > MAX_FILE_BYTES:
+                yield info.filename, _too_large(info.file_size)
+                continue
+            # Read here: the archive is closed once this generator finishes
+            data = zf.read(info)
+            yield info.filename, (lambda data=data: data)
+
+
+def _too_large(size):
+    def loader():
+        raise ValueError(f"File is {size} bytes, limit is {MAX_FILE_BYTES}")
+    return loader
+
+
+def load_completed(jsonl_path):
+    """Names of files that already have a successful result in ``jsonl_path``."""
+    completed = set()
+    if not jsonl_path or not os.path.exists(jsonl_path):
+        return completed
+    with open(jsonl_path) as f:
+        completed.update(completed_from_lines(f))
+    return completed
+
+
+def completed_from_lines(lines):
+    """Yield the names of successful records in an iterable of JSONL lines."""
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # a truncated last line from an interrupted run
+        if isinstance(record, dict) and record.get('status') == 'ok' and record.get('file'):
+            yield record['file']
+
+
+def parse_one(name, loader, cache=None, use_llm=False):
+    """Parse a single resume and return its result record; never raises."""
+    record = {'file': name, 'status': 'ok', 'timings': {}}
+    timings = record['timings']
+    started = time.perf_counter()
+    try:
+        pdf_bytes = loader()
+        record['sha256'] = digest = pdf_digest(pdf_bytes)
+        version = score_version(use_llm)
+        cached = cache.get(digest, version) if cache else None
+        if cached:
+            record['data'], record['score'], record['breakdown'] = cached
+            record['cached'] = True
+        else:
+            mark = time.perf_counter()
+            resume_text, links = extract_text_and_links_from_pdf(pdf_bytes)
+            timings['extract'] = round(time.perf_counter() - mark, 4)
+            if not resume_text:
+                raise ValueError("Could not extract text from PDF")
+
+            mark = time.perf_counter()
+            extracted_data = ats_extractor(resume_text, links)
+            timings['extraction_llm'] = round(time.perf_counter() - mark, 4)
+            if 'error' in extracted_data:
+                raise RuntimeError(f"{extracted_data['error']}: {extracted_data.get('details')}")
+
+            mark = time.perf_counter()
+            score, breakdown, score_fallback = score_parsed_resume(resume_text, extracted_data, use_llm)
+            timings['score'] = round(time.perf_counter() - mark, 4)
+
+            record.update(data=extracted_data, score=score, breakdown=breakdown)
+            if score_fallback:
+                record['score_fallback'] = True
+            if extracted_data.get('partial'):
+                record['partial'] = True
+            elif cache and not score_fallback:
+                cache.put(digest, version, extracted_data, score, breakdown)
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)
+    timings['total'] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def run_batch(sources, concurrency=DEFAULT_CONCURRENCY, completed=(), use_llm=False,
+              cache=None, max_files=MAX_BATCH_FILES):
+    """
+    Parse (name, loader) sources on at most ``concurrency`` threads and yield
+    result records as they complete. Files named in ``completed`` are skipped.
+    Only ``2 * concurrency`` files are loaded ahead, so large archives are
+    never held in memory at once.
+    """
+    completed = set(completed)
+    pending = set()
+    submitted = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for name, loader in sources:
+            if name in completed:
+                continue
+            if submitted >= max_files:
+                yield {'file': name, 'status': 'error',
+                       'error': f"Batch limit of {max_files} files reached"}
+                continue
+            pending.add(executor.submit(parse_one, name, loader, cache, use_llm))
+            submitted += 1
+            while len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a directory or zip of PDF resumes to JSONL.")
+    parser.add_argument('input', help="directory or .zip archive of PDF resumes")
+    parser.add_argument('-o', '--output', default='results.jsonl', help="JSONL file to append results to")
+    parser.add_argument('-c', '--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--llm-score', action='store_true', help="score with Gemini instead of locally")
+    parser.add_argument('--no-resume', action='store_true', help="re-parse files already in the output")
+    parser.add_argument('--no-cache', action='store_true', help="skip the shared parse cache")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.input):
+        sources = iter_directory_sources(args.input)
+    elif zipfile.is_zipfile(args.input):
+        sources = iter_zip_sources(args.input)
+    else:
+        parser.error(f"{args.input} is neither a directory nor a zip archive")
+
+    completed = set() if args.no_resume else load_completed(args.output)
+    if completed:
+        logging.info(f"Skipping {len(completed)} files already in {args.output}")
+    cache = None if args.no_cache else ParseCache()
+
+    counts = {'ok': 0, 'error': 0}
+    with open(args.output, 'a') as out:
+        for record in run_batch(sources, args.concurrency, completed, args.llm_score, cache):
+            out.write(json.dumps(record) + '\n')
+            out.flush()  # keep the file resumable if the run is interrupted
+            counts[record['status']] += 1
+            print(f"[{record['status']}] {record['file']} "
+                  f"{record.get('timings', {}).get('total', 0):.2f}s", file=sys.stderr)
+    print(f"Done: {counts['ok']} ok, {counts['error']} failed", file=sys.stderr)
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
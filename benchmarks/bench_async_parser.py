@@ -0,0 +1,71 @@
+"""
+Concurrency benchmark: N parses in one worker, blocking vs asyncio.
+
+The blocking path is the /parser pipeline on a single thread (one WSGI
+worker); the async path is async_parser.parse_resume_async on one event
+loop, as served by asgi.py. Gemini is the local stub with a fixed latency
+per call, so the difference is time spent waiting on the model.
+
+    python benchmarks/bench_async_parser.py [--parses N] [--latency S] [--no-llm-score]
+"""
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import corpus
+import gemini_stub
+
+
+def blocking_parse(pdf_bytes, use_llm):
+    from resume_parser import (extract_text_and_links_from_pdf, ats_extractor,
+                               calculate_ats_score)
+    text, links = extract_text_and_links_from_pdf(pdf_bytes)
+    data = ats_extractor(text, links)
+    return calculate_ats_score(text, data, use_llm=use_llm)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--parses', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.25, help="stub seconds per Gemini call")
+    parser.add_argument('--no-llm-score', dest='llm_score', action='store_false')
+    args = parser.parse_args()
+
+    stub = gemini_stub.install(latency=args.latency)
+    logging.disable(logging.CRITICAL)
+    from async_parser import parse_resume_async
+
+    # Distinct resumes so no call is answered from a cache
+    pdfs = [corpus.resume_pdf('medium', seed) for seed in range(args.parses)]
+
+    start = time.perf_counter()
+    for pdf_bytes in pdfs:
+        blocking_parse(pdf_bytes, args.llm_score)
+    blocking = time.perf_counter() - start
+    calls = stub.calls
+
+    async def run_async():
+        return await asyncio.gather(*(parse_resume_async(pdf_bytes, use_llm=args.llm_score)
+                                      for pdf_bytes in pdfs))
+
+    start = time.perf_counter()
+    results = asyncio.run(run_async())
+    concurrent = time.perf_counter() - start
+    assert all('error' not in result for result in results)
+
+    print(f"{args.parses} parses, {calls // args.parses} Gemini calls each, "
+          f"{args.latency:.2f}s stub latency")
+    print(f"{'blocking (one worker thread)':<32} {blocking:8.2f}s  {args.parses / blocking:8.1f} parses/s")
+    print(f"{'asyncio (one event loop)':<32} {concurrent:8.2f}s  {args.parses / concurrent:8.1f} parses/s")
+    print(f"{'speedup':<32} {blocking / concurrent:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
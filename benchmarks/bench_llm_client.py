@@ -0,0 +1,80 @@
+"""
+Load test for llm_client.LLMClient against the fault-injecting Gemini stub.
+
+Runs four scenarios on worker threads and prints what reached the stub
+(upstream calls, peak concurrency), what callers saw (successes, errors,
+latency percentiles) and where the adaptive limit ended up:
+
+- healthy:    jittered latency, no errors
+- duplicates: every caller sends one of a few prompts (singleflight)
+- flaky:      a share of calls fail with 503 and are retried
+- outage:     every call fails; the circuit opens and callers fail fast
+
+    python benchmarks/bench_llm_client.py [--callers N] [--requests N] [--latency S]
+"""
+import sys
+import time
+import logging
+import argparse
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import gemini_stub
+from llm_client import LLMClient, CircuitBreaker
+
+
+def run_scenario(name, stub, client, requests, callers, distinct):
+    def one(i):
+        start = time.perf_counter()
+        try:
+            client.generate(f"prompt {i % distinct}", 'bench')
+            return True, time.perf_counter() - start, None
+        except Exception as e:
+            return False, time.perf_counter() - start, type(e).__name__
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(callers) as pool:
+        results = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency, _ in results)
+    errors = {}
+    for ok, _, error in results:
+        if not ok:
+            errors[error] = errors.get(error, 0) + 1
+    stats = client.stats()
+    print(f"{name:<11} {elapsed:6.2f}s  ok {sum(ok for ok, _, _ in results):4d}/{requests:<4d} "
+          f"upstream {stub.calls:4d}  peak {stub.max_concurrent:3d}  "
+          f"p50 {statistics.median(latencies) * 1000:7.1f}ms  "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.1f}ms  "
+          f"limit {stats['concurrency_limit']:5.2f}  circuit {stats['circuit_state']}"
+          + (f"  errors {errors}" if errors else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--callers', type=int, default=32, help="concurrent caller threads")
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--latency', type=float, default=0.02, help="stub seconds per call")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    scenarios = [
+        ('healthy', dict(jitter=args.latency), {}, args.requests),
+        ('duplicates', dict(jitter=args.latency), {}, 4),
+        ('flaky', dict(jitter=args.latency, error_rate=0.2), {}, args.requests),
+        ('outage', dict(error_rate=1.0), dict(breaker=CircuitBreaker(reset_timeout=60)), args.requests),
+    ]
+    for name, stub_options, client_options, distinct in scenarios:
+        stub = gemini_stub.StubModel(args.latency, **stub_options)
+        client = LLMClient(stub, deadline=10, **client_options)
+        run_scenario(name, stub, client, args.requests, args.callers, distinct)
+
+
+if __name__ == '__main__':
+    main()
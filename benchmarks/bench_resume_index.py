@@ -0,0 +1,109 @@
+"""
+Resume search index benchmark: indexing, cold load and job-description ranking.
+
+Builds an index of N synthetic parse results (extractor-shaped JSON with a
+Zipf-like vocabulary: a few very common terms and a long tail), reopens it
+from disk as a new process would, then ranks it against job descriptions.
+
+    python benchmarks/bench_resume_index.py [--resumes N] [--queries N]
+"""
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from resume_index import ResumeIndex
+
+SKILLS = ['Python', 'Java', 'Go', 'Rust', 'C++', 'C#', 'SQL', 'PostgreSQL', 'Flask', 'Django',
+          'React', 'Node.js', 'Docker', 'Kubernetes', 'Terraform', 'AWS', 'GCP', 'Azure',
+          'Spark', 'Kafka', 'Airflow', 'TensorFlow', 'PyTorch', 'Machine Learning', 'CI/CD',
+          'GraphQL', 'Redis', 'Elasticsearch', 'Leadership', 'Communication', 'Mentoring']
+TITLES = ['Software Engineer', 'Senior Software Engineer', 'Data Engineer', 'Data Scientist',
+          'Backend Engineer', 'Frontend Engineer', 'DevOps Engineer', 'Site Reliability Engineer',
+          'Machine Learning Engineer', 'Engineering Manager', 'Platform Engineer']
+WORDS = ("built designed led optimized migrated scaled automated reduced improved launched "
+         "latency pipeline service api users customers revenue team platform data cloud "
+         "testing release monitoring dashboards distributed streaming batch realtime payments "
+         "search recommendations infrastructure security compliance mobile analytics").split()
+JOB_DESCRIPTIONS = [
+    "Senior Backend Engineer: Python, Django or Flask, PostgreSQL, Redis and Kafka. You will "
+    "design distributed services for payments, own latency and reliability, and mentor the team.",
+    "Machine Learning Engineer with PyTorch or TensorFlow, Spark and Airflow pipelines on GCP. "
+    "Experience shipping recommendations or search ranking to production is a plus.",
+    "DevOps / SRE: Kubernetes, Terraform, AWS, CI/CD and monitoring dashboards; improve release "
+    "automation and infrastructure security and compliance.",
+]
+
+
+def parse_result(rng, seed):
+    def sentence(words=14):
+        # Mostly common words, plus a long tail of rare ones
+        return ' '.join(rng.choice(WORDS) if rng.random() < 0.8 else f"term{int(rng.paretovariate(1.2))}"
+                        for _ in range(words))
+    return {
+        'personal_info': {'full_name': f'Candidate {seed}', 'email_id': f'c{seed}@example.com'},
+        'professional_summary': sentence(40),
+        'employment_details': [
+            {'company': f'Company {rng.randrange(2000)}', 'title': rng.choice(TITLES),
+             'duration': '2019 - 2023', 'responsibilities': [sentence() for _ in range(4)],
+             'achievements': [sentence(8)]}
+            for _ in range(rng.randint(1, 5))
+        ],
+        'education': [{'degree': 'B.Sc. Computer Science', 'institution': f'University {rng.randrange(300)}',
+                       'year': '2015', 'gpa': None}],
+        'projects': [{'name': f'Project {rng.randrange(10000)}', 'description': sentence(20),
+                      'technologies': rng.sample(SKILLS, 3), 'link': None}
+                     for _ in range(rng.randint(0, 3))],
+        'technical_skills': rng.sample(SKILLS[:-3], rng.randint(4, 12)),
+        'soft_skills': rng.sample(SKILLS[-3:], 2),
+        'certifications': [],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=30)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / 'index.db'
+        index = ResumeIndex(path)
+        start = time.perf_counter()
+        for seed in range(args.resumes):
+            index.add(f"{seed:064x}", parse_result(rng, seed), ats_score=rng.randrange(100), owner='bench')
+        indexing = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = ResumeIndex(path)
+        documents = len(reopened)
+        load = time.perf_counter() - start
+
+        timings = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            results = reopened.search(JOB_DESCRIPTIONS[i % len(JOB_DESCRIPTIONS)], limit=10)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+
+    print(f"{documents} resumes, {len(reopened._postings)} distinct terms")
+    print(f"{'index (incremental adds)':<28} {indexing:8.2f}s  {indexing / args.resumes * 1000:6.2f}ms/resume")
+    print(f"{'cold load from disk':<28} {load:8.2f}s")
+    print(f"{'search p50':<28} {statistics.median(timings) * 1000:8.1f}ms")
+    print(f"{'search p95':<28} {timings[int(len(timings) * 0.95) - 1] * 1000:8.1f}ms")
+    top = results[0]
+    print(f"top hit: {top['name']} ({top['headline']}), relevance {top['relevance']}, matched "
+          + ', '.join(f"{m['term']} [{'/'.join(m['fields'])}]" for m in top['matched_terms'][:6]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Concurrency benchmark: login lookups against a large synthetic users table.
+
+Compares the old access pattern (new sqlite3 connection per request, no index
+on username) with user_store.UserStore (pooled per-thread connections, WAL,
+unique username index), with several threads issuing logins at once.
+
+    python benchmarks/bench_user_store.py [--users N] [--threads T] [--logins L]
+
+Password hashing is left out by default so the numbers reflect the database;
+pass --verify to include werkzeug's check_password_hash as the real route does.
+"""
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from werkzeug.security import generate_password_hash, check_password_hash
+from user_store import UserStore
+
+
+def build_table(path, users, password_hash):
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE users (id INTEGER PRIMARY KEY, username TEXT, password TEXT)')
+    conn.executemany("INSERT INTO users (username, password) VALUES (?, ?)",
+                     ((f"user{i:07d}", password_hash) for i in range(users)))
+    conn.commit()
+    conn.close()
+
+
+def legacy_lookup(path):
+    def lookup(username):
+        conn = sqlite3.connect(path)
+        c = conn.cursor()
+        c.execute("SELECT password FROM users WHERE username = ?", (username,))
+        user = c.fetchone()
+        conn.close()
+        return user[0] if user else None
+    return lookup
+
+
+def run(lookup, usernames, threads, verify):
+    chunks = [usernames[i::threads] for i in range(threads)]
+    errors = []
+
+    def worker(names):
+        try:
+            for name in names:
+                password_hash = lookup(name)
+                if verify and not check_password_hash(password_hash, 'secret'):
+                    raise AssertionError(name)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return len(usernames) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=200_000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--logins', type=int, default=2_000)
+    parser.add_argument('--verify', action='store_true', help="include password hash checks")
+    args = parser.parse_args()
+
+    password_hash = generate_password_hash('secret')
+    rng = random.Random(0)
+    usernames = [f"user{rng.randrange(args.users):07d}" for _ in range(args.logins)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = str(Path(tmp) / 'legacy.db')
+        pooled_db = str(Path(tmp) / 'pooled.db')
+        print(f"Building {args.users} synthetic users...")
+        build_table(legacy_db, args.users, password_hash)
+        build_table(pooled_db, args.users, password_hash)
+
+        store = UserStore(pooled_db)
+        store.migrate()  # WAL + unique index
+        results = {
+            'legacy (connect per request, no index)': run(
+                legacy_lookup(legacy_db), usernames, args.threads, args.verify),
+            'UserStore (pooled, WAL, indexed)': run(
+                store.get_password_hash, usernames, args.threads, args.verify),
+        }
+
+    for label, rate in results.items():
+        print(f"{label:<42} {rate:12.0f} logins/s")
+    legacy, pooled = results.values()
+    print(f"{'speedup':<42} {pooled / legacy:12.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Synthetic resume corpus for the benchmarks.
+
+``resume_data(size)`` builds builder-form data (the JSON maker.js posts) and
+``resume_pdf(size)`` renders the same resume as a text PDF with link
+annotations, so parser benchmarks never depend on real user files.
+"""
+import random
+
+SIZES = {
+    # name: (experience entries, projects, bullets per entry, words per bullet)
+    'small': (1, 1, 2, 10),
+    'medium': (4, 3, 4, 16),
+    'large': (12, 10, 6, 24),
+}
+
+WORDS = ("built designed led optimized migrated scaled automated reduced improved launched "
+         "python flask sql kubernetes latency pipeline service api users customers revenue "
+         "team platform data cloud testing release monitoring dashboards 40% $2M 3x "
+         "c++ react docker aws spark & # _ { } ~ ^ %").split()
+
+SKILLS = ['Python', 'C++', 'SQL', 'Flask', 'Docker', 'Kubernetes', 'AWS', 'React', 'Spark',
+          'Machine Learning', 'Leadership', 'Communication']
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def resume_data(size='medium', seed=0):
+    """Builder-form resume data of the given size; deterministic for a seed."""
+    experiences, projects, bullets, words = SIZES[size]
+    rng = random.Random(f"{size}:{seed}")
+    return {
+        'personal_info': {
+            'name': f'Candidate {seed}',
+            'email': f'candidate{seed}@example.com',
+            'phone': f'+1 555 01{seed % 100:02d}',
+            'github': f'https://github.com/candidate{seed}',
+            'linkedin': f'https://linkedin.com/in/candidate{seed}',
+        },
+        'summary': ' '.join(_sentence(rng, words) for _ in range(3)),
+        'experience': [
+            {
+                'title': f'Engineer {i}', 'company': f'Company {i}', 'duration': f'{2010 + i} - {2011 + i}',
+                'description': _sentence(rng, words),
+                'responsibilities': [_sentence(rng, words) for _ in range(bullets)],
+            }
+            for i in range(experiences)
+        ],
+        'projects': [
+            {'name': f'Project {i}', 'description': _sentence(rng, words * 2),
+             'link': f'https://github.com/candidate{seed}/project{i}'}
+            for i in range(projects)
+        ],
+        'education': [
+            {'degree': 'B.Sc. Computer Science', 'institution': 'State University',
+             'year': '2010', 'gpa': '3.7'},
+        ],
+        'skills': {
+            'Technical Skills': SKILLS[:8],
+            'Soft Skills': SKILLS[-2:],
+        },
+    }
+
+
+def resume_lines(data):
+    """Plain-text lines of a resume, roughly as a PDF would lay them out."""
+    info = data['personal_info']
+    lines = [info['name'], f"{info['email']} | {info['phone']} | {info['github']} | {info['linkedin']}",
+             'Summary', data['summary'], 'Experience']
+    for exp in data['experience']:
+        lines += [f"{exp['title']} at {exp['company']} ({exp['duration']})", exp['description']]
+        lines += [f"- {item}" for item in exp['responsibilities']]
+    lines.append('Projects')
+    for project in data['projects']:
+        lines += [f"{project['name']} - {project['link']}", project['description']]
+    lines.append('Education')
+    lines += [f"{edu['degree']}, {edu['institution']} {edu['year']}" for edu in data['education']]
+    lines.append('Skills')
+    lines += [f"{group}: {', '.join(skills)}" for group, skills in data['skills'].items()]
+    return lines
+
+
+def _wrap(line, width=95):
+    words, current, out = line.split(), '', []
+    for word in words:
+        if current and len(current) + len(word) + 1 > width:
+            out.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    out.append(current)
+    return out
+
+
+def _pdf_string(text):
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return '(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def write_text_pdf(lines, links=(), lines_per_page=60):
+    """
+    Minimal PDF writer: Helvetica text, one line per row, and one URI link
+    annotation per entry of ``links`` on the first page.
+    """
+    rows = [row for line in lines for row in _wrap(line)]
+    pages = [rows[i:i + lines_per_page] for i in range(0, len(rows), lines_per_page)] or [[]]
+
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for number, page_rows in enumerate(pages):
+        ops = ["BT /F1 10 Tf 12 TL 50 800 Td"] + [f"{_pdf_string(row)} Tj T*" for row in page_rows] + ["ET"]
+        stream = '\n'.join(ops).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        annots = ''
+        if number == 0 and links:
+            annot_ids = []
+            for index, url in enumerate(links):
+                y = 780 - index * 14
+                objects.append(
+                    f"<< /Type /Annot /Subtype /Link /Rect [50 {y} 300 {y + 12}] /Border [0 0 0] "
+                    f"/A << /S /URI /URI {_pdf_string(url)} >> >>".encode('latin-1'))
+                annot_ids.append(len(objects))
+            annots = ' /Annots [' + ' '.join(f"{i} 0 R" for i in annot_ids) + ']'
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {content_id} 0 R "
+            f"/Resources << /Font << /F1 3 0 R >> >>{annots} >>".encode('latin-1'))
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = (f"<< /Type /Pages /Count {len(page_ids)} /Kids ["
+                  + ' '.join(f"{i} 0 R" for i in page_ids) + "] >>").encode('latin-1')
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b''.join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def resume_pdf(size='medium', seed=0):
+    """PDF bytes for the synthetic resume of the given size."""
+    data = resume_data(size, seed)
+    info = data['personal_info']
+    links = [info['github'], info['linkedin']] + [p['link'] for p in data['projects']]
+    return write_text_pdf(resume_lines(data), links)
@@ -0,0 +1,135 @@
+"""
+Deterministic local stand-in for the Gemini GenerativeModel.
+
+Responses depend only on the prompt, so benchmark runs are repeatable and
+need no network or API key. ``install()`` swaps the stub into
+resume_parser in place of the real model. Latency jitter and errors can be
+injected to exercise llm_client's limiter, retries and circuit breaker.
+"""
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+
+
+class StubAPIError(Exception):
+    """Shaped like google.api_core exceptions: an HTTP status in ``code``."""
+
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class StubModel:
+    """
+    Answers extraction and scoring prompts with canned, schema-shaped JSON.
+
+    Each call takes ``latency`` seconds plus up to ``jitter`` more and fails
+    with an HTTP ``error_code`` at ``error_rate``; ``outage()`` makes every
+    call fail until ``restore()``. A request_options timeout shorter than
+    the latency raises a 504 after the timeout, like the real client.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_code=503, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.calls = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self._down = False
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def outage(self):
+        self._down = True
+
+    def restore(self):
+        self._down = False
+
+    def _start(self, kwargs):
+        """Count the call and decide its delay and failure up front."""
+        with self._lock:
+            self.calls += 1
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._down or self._rng.random() < self.error_rate
+        timeout = (kwargs.get('request_options') or {}).get('timeout')
+        if timeout is not None and delay > timeout:
+            return timeout, StubAPIError(504, "Deadline Exceeded")
+        return delay, StubAPIError(self.error_code, "Service Unavailable") if failed else None
+
+    def _finish(self):
+        with self._lock:
+            self.concurrent -= 1
+
+    def _respond(self, prompt):
+        seed = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:8], 16)
+        if '"score"' in prompt and 'evaluator' in prompt:
+            return StubResponse(json.dumps({'score': 40 + seed % 60}))
+        return StubResponse('```json\n' + json.dumps({
+            'personal_info': {'full_name': 'Stub Candidate', 'email_id': 'stub@example.com',
+                              'phone': None, 'location': None,
+                              'github_portfolio': None, 'linkedin_id': None},
+            'professional_summary': 'Synthetic summary.',
+            'employment_details': [{'company': f'Company {seed % 7}', 'title': 'Engineer',
+                                    'duration': '2019 - 2023',
+                                    'responsibilities': ['Reduced latency by 40%'],
+                                    'achievements': []}],
+            'education': [{'degree': 'B.Sc.', 'institution': 'State University',
+                           'year': '2015', 'gpa': None}],
+            'projects': [],
+            'technical_skills': ['Python', 'SQL'],
+            'soft_skills': ['Communication'],
+            'certifications': [],
+            'extracted_links': [],
+        }) + '\n```')
+
+    def generate_content(self, prompt, **kwargs):
+        delay, error = self._start(kwargs)
+        try:
+            if delay:
+                time.sleep(delay)
+            if error:
+                raise error
+            return self._respond(prompt)
+        finally:
+            self._finish()
+
+    async def generate_content_async(self, prompt, **kwargs):
+        # Same answers; the latency is awaited so concurrent calls overlap
+        delay, error = self._start(kwargs)
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            if error:
+                raise error
+            return self._respond(prompt)
+        finally:
+            self._finish()
+
+
+def install(latency=0.0, **options):
+    """
+    Point resume_parser's model, LLM client and extractor at a StubModel and
+    return it. ``options`` are StubModel fault-injection settings.
+    """
+    import resume_parser
+    from extractors import make_extractor
+    from llm_client import LLMClient
+
+    stub = StubModel(latency, **options)
+    resume_parser.model = stub
+    resume_parser.llm = LLMClient(stub)
+    resume_parser.extractor = make_extractor(resume_parser.EXTRACTOR_BACKEND, resume_parser.llm)
+    return stub
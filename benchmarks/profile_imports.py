@@ -0,0 +1,53 @@
+"""
+Import-time profile of the app (or any module) using ``python -X importtime``.
+
+    python benchmarks/profile_imports.py                # import app
+    python benchmarks/profile_imports.py -m asgi -n 30  # other module, top 30
+    python benchmarks/profile_imports.py --warm-up      # app import plus app.warm_up()
+
+Prints the wall time of the import in a fresh interpreter and the modules
+with the largest cumulative import time.
+"""
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def profile(module, warm_up=False):
+    """Return (total seconds, [(cumulative us, self us, module name)]) for one cold import."""
+    code = f"import time; t = time.perf_counter(); import {module}"
+    if warm_up:
+        code += f"; {module}.warm_up()"
+    code += "; print(time.perf_counter() - t)"
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', code],
+                             cwd=ROOT, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise SystemExit(process.stderr)
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return float(process.stdout.strip().splitlines()[-1]), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-m', '--module', default='app')
+    parser.add_argument('-n', '--top', type=int, default=20)
+    parser.add_argument('--warm-up', action='store_true', help="also call <module>.warm_up()")
+    args = parser.parse_args()
+
+    total, rows = profile(args.module, args.warm_up)
+    print(f"import {args.module}{' + warm_up()' if args.warm_up else ''}: {total * 1000:.0f} ms\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, own, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:14.1f} {own / 1000:9.1f}  {name}")
+
+
+if __name__ == '__main__':
+    main()
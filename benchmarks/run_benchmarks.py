@@ -0,0 +1,213 @@
+"""
+Benchmark suite for the builder and parser hot paths.
+
+Runs every case against the synthetic corpus (benchmarks/corpus.py) with the
+Gemini stub (benchmarks/gemini_stub.py), writes machine-readable JSON, and
+compares medians with a baseline file. Any case slower than the baseline by
+more than --threshold makes the run exit with status 1.
+
+    python benchmarks/run_benchmarks.py                      # run + compare
+    python benchmarks/run_benchmarks.py --update-baseline    # accept results
+    python benchmarks/run_benchmarks.py -k parser -k preview # subset of cases
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import corpus
+import gemini_stub
+
+RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+DEFAULT_OUTPUT = RESULTS_DIR / 'latest.json'
+DEFAULT_BASELINE = RESULTS_DIR / 'baseline.json'
+DEFAULT_THRESHOLD = 0.25
+# Differences below this many milliseconds are treated as noise
+MIN_REGRESSION_MS = 0.05
+
+
+def measure(fn, min_time=0.3, max_iterations=2000, min_iterations=3):
+    """Time ``fn`` repeatedly; returns summary statistics in milliseconds."""
+    fn()  # warm-up
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_iterations and (len(samples) < min_iterations
+                                             or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'median_ms': round(statistics.median(samples), 4),
+        'mean_ms': round(statistics.fmean(samples), 4),
+        'p95_ms': round(samples[int(0.95 * (len(samples) - 1))], 4),
+        'min_ms': round(samples[0], 4),
+        'iterations': len(samples),
+    }
+
+
+class Skip(Exception):
+    """Raised by a case that cannot run in this environment."""
+
+
+def build_cases(workdir):
+    import mmaker
+    import resume_parser
+    import app as webapp
+    from parse_cache import ParseCache
+    from resume_index import ResumeIndex
+    from resume_model import Resume, render_text
+    from draft_pdf import render_draft_pdf
+
+    gemini_stub.install()
+    # The app logs at DEBUG; log formatting would dominate the timings
+    logging.disable(logging.CRITICAL)
+    # Keep benchmark parses out of the real cache and search index databases
+    webapp.parse_cache = ParseCache(Path(workdir) / 'parse_cache.db')
+    webapp.resume_index = ResumeIndex(Path(workdir) / 'resume_index.db')
+    client = webapp.app.test_client()
+    with client.session_transaction() as session:
+        session['username'] = 'benchmark'
+
+    cases = {}
+    for size in corpus.SIZES:
+        data = corpus.resume_data(size)
+        pdf_bytes = corpus.resume_pdf(size)
+        text = corpus.resume_lines(data)
+        tex = mmaker.generate_autocv(data, preview=True)
+        form = {'data': json.dumps(data)}
+
+        cases[f'escape_latex[{size}]'] = lambda text=text: [mmaker.escape_latex(line) for line in text]
+        cases[f'generate_autocv_preview[{size}]'] = lambda data=data: mmaker.generate_autocv(data, preview=True)
+        cases[f'render_text[{size}]'] = lambda data=data: render_text(Resume.from_form(data))
+        cases[f'render_draft_pdf[{size}]'] = lambda data=data: render_draft_pdf(data)
+        cases[f'extract_text_and_links_from_pdf[{size}]'] = (
+            lambda pdf_bytes=pdf_bytes: resume_parser.extract_text_and_links_from_pdf(pdf_bytes))
+
+        def parser_route(pdf_bytes=pdf_bytes):
+            response = client.post('/parser', data={
+                'resume': (io.BytesIO(pdf_bytes), 'resume.pdf'), 'refresh': '1'},
+                content_type='multipart/form-data')
+            assert response.status_code == 200, response.status_code
+        cases[f'route_parser[{size}]'] = parser_route
+
+        def preview_route(form=form):
+            response = client.post('/preview_html', data=form)
+            assert response.status_code == 200, response.status_code
+        cases[f'route_preview_html[{size}]'] = preview_route
+
+        def text_preview_route(form=form):
+            response = client.post('/preview', data=form)
+            assert response.status_code == 200, response.status_code
+        cases[f'route_preview[{size}]'] = text_preview_route
+
+        def tex_to_pdf_build(tex=tex):
+            if not shutil.which('pdflatex'):
+                raise Skip('pdflatex not installed')
+            build_dir = tempfile.mkdtemp(dir=workdir)
+            mmaker.compile_tex_source(tex, build_dir)
+        cases[f'tex_to_pdf[{size}]'] = tex_to_pdf_build
+
+    return cases
+
+
+# Slow cases get fewer iterations
+SLOW_CASES = ('tex_to_pdf',)
+
+
+def run(selected):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, fn in build_cases(workdir).items():
+            if selected and not any(pattern in name for pattern in selected):
+                continue
+            slow = name.startswith(SLOW_CASES)
+            try:
+                results[name] = measure(fn, min_time=0 if slow else 0.3,
+                                        min_iterations=3 if slow else 5)
+            except Skip as e:
+                results[name] = {'skipped': str(e)}
+            summary = results[name].get('median_ms', results[name].get('skipped'))
+            print(f"  {name:<45} {summary}", file=sys.stderr)
+    return results
+
+
+def metadata():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                  capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        revision = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'revision': revision}
+
+
+def compare(results, baseline, threshold):
+    """Return a list of (case, baseline_ms, current_ms, ratio) regressions."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or 'median_ms' not in previous or 'median_ms' not in current:
+            continue
+        before, after = previous['median_ms'], current['median_ms']
+        if after > before * (1 + threshold) and after - before > MIN_REGRESSION_MS:
+            regressions.append((name, before, after, after / before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the resume builder/parser benchmark suite.")
+    parser.add_argument('-k', dest='selected', action='append', default=[],
+                        help="only run cases whose name contains this string (repeatable)")
+    parser.add_argument('-o', '--output', default=str(DEFAULT_OUTPUT))
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown of the median before failing (0.25 = 25%%)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="write these results as the new baseline")
+    args = parser.parse_args()
+
+    print("Running benchmarks...", file=sys.stderr)
+    report = {'meta': metadata(), 'results': run(args.selected)}
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.update_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"Baseline updated: {args.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against; run with --update-baseline to create one.",
+              file=sys.stderr)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(report['results'], baseline, args.threshold)
+    if regressions:
+        print(f"\nREGRESSIONS (>{args.threshold:.0%} slower than baseline):", file=sys.stderr)
+        for name, before, after, ratio in regressions:
+            print(f"  {name:<45} {before:10.3f} ms -> {after:10.3f} ms  ({ratio:.2f}x)",
+                  file=sys.stderr)
+        return 1
+    print("No regressions against baseline.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from mmaker import UPLOAD_FOLDER, render_tex, render_cache, compile_tex_source
+from artifact_store import ArtifactStore
+import instrumentation
+from worker_pool import worker_context
+
+# Pool and backpressure settings for PDF builds
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+MAX_QUEUE_DEPTH = 16
+JOB_TTL = 15 * 60  # seconds a finished job stays queryable
+JOBS_FOLDER = UPLOAD_FOLDER / 'jobs'
+ARTIFACTS_FOLDER = UPLOAD_FOLDER / 'artifacts'
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+class QueueFullError(Exception):
+    """Raised when too many builds are already waiting for a worker."""
+
+
+def _compile_job(tex_content, workdir):
+    """
+    Runs inside a pool process; each job compiles in its own directory.
+    Returns (pdf_path, error, events) so the parent can replay the worker's
+    timing spans and failure counters into its own metrics.
+    """
+    with instrumentation.collecting() as events:
+        try:
+            return compile_tex_source(tex_content, workdir), None, events
+        except Exception as e:
+            return None, str(e), events
+
+
+class BuildJob:
+    def __init__(self, owner, cache_key):
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.cache_key = cache_key
+        self.workdir = JOBS_FOLDER / self.id
+        self.created = time.time()
+        self.finished = None
+        self.pdf_path = None
+        self.sha256 = None
+        self.error = None
+        self.timings = {}
+        self.future = None
+        self._done = threading.Event()
+
+    @property
+    def status(self):
+        if self.finished is not None:
+            return FAILED if self.error else DONE
+        if self.future is not None and self.future.running():
+            return RUNNING
+        return QUEUED
+
+    def wait(self, timeout):
+        return self._done.wait(timeout)
+
+    def _finish(self, artifact=None, error=None):
+        if artifact is not None:
+            self.pdf_path = artifact.path
+            self.sha256 = artifact.sha256
+        self.error = error
+        self.finished = time.time()
+        self._done.set()
+
+    def to_dict(self):
+        info = {'job_id': self.id, 'status': self.status}
+        if self.error:
+            info['error'] = self.error
+        if self.sha256:
+            info['sha256'] = self.sha256
+        if self.finished is not None:
+            info['seconds'] = round(self.finished - self.created, 3)
+        if self.timings:
+            info['timings'] = self.timings
+        return info
+
+
+class BuildQueue:
+    """
+    Runs pdflatex builds on a bounded process pool so request threads never
+    block on a compile. Cache hits complete immediately without using a worker.
+    Finished PDFs are published to the owner's artifact store.
+    """
+
+    def __init__(self, artifacts, max_workers=MAX_WORKERS, max_depth=MAX_QUEUE_DEPTH,
+                 job_ttl=JOB_TTL):
+        self.artifacts = artifacts
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.job_ttl = job_ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        # Created lazily so importing the app does not start workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=worker_context())
+        return self._executor
+
+    def _submit(self, tex_content, workdir):
+        # Caller holds self._lock. A worker that dies (OOM killer, SIGKILL)
+        # breaks the whole pool, so replace it rather than failing every build
+        try:
+            return self._get_executor().submit(_compile_job, tex_content, workdir)
+        except BrokenProcessPool:
+            logging.warning("Build worker pool is broken; starting a new one")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            return self._get_executor().submit(_compile_job, tex_content, workdir)
+
+    def pending(self):
+        with self._lock:
+            return self._pending()
+
+    def _pending(self):
+        # Caller holds self._lock
+        return sum(1 for job in self._jobs.values() if job.finished is None)
+
+    def submit(self, data, owner):
+        tex_content, cache_key = render_tex(data)
+        job = BuildJob(owner, cache_key)
+
+        with self._lock:
+            self._prune()
+            cached_pdf = render_cache.get(cache_key)
+            if cached_pdf:
+                job._finish(artifact=self.artifacts.publish(owner, cached_pdf))
+                self._jobs[job.id] = job
+                return job
+            if self._pending() >= self.max_depth:
+                raise QueueFullError(f"Build queue is full ({self.max_depth} jobs pending)")
+            job.workdir.mkdir(parents=True, exist_ok=True)
+            try:
+                job.future = self._submit(tex_content, str(job.workdir))
+            except Exception:
+                shutil.rmtree(job.workdir, ignore_errors=True)
+                raise
+            # Only jobs that reached a worker count towards the queue depth
+            self._jobs[job.id] = job
+
+        job.future.add_done_callback(lambda future: self._on_done(job, future))
+        return job
+
+    def _on_done(self, job, future):
+        try:
+            pdf_path, error, events = future.result()
+            instrumentation.replay(events)
+            job.timings = {name: round(seconds, 3) for kind, name, seconds, _ in events
+                           if kind == 'span'}
+            if error:
+                raise RuntimeError(error)
+            pdf_path = render_cache.put(job.cache_key, pdf_path)
+            shutil.rmtree(job.workdir, ignore_errors=True)
+            job._finish(artifact=self.artifacts.publish(job.owner, pdf_path))
+        except Exception as e:
+            logging.error(f"Build job {job.id} failed: {e}")
+            job._finish(error=str(e))
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.job_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished is not None and job.finished < cutoff:
+                del self._jobs[job_id]
+                shutil.rmtree(job.workdir, ignore_errors=True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+artifact_store = ArtifactStore(ARTIFACTS_FOLDER)
+build_queue = BuildQueue(artifact_store)
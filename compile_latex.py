@@ -1,63 +1,197 @@
-import subprocess
-import os
-from pathlib import Path
-
-def tex_to_pdf(tex_file_path):
-    """
-    Converts a .tex file to PDF with explicit path handling and validation
-    """
-    tex_path = Path(tex_file_path).absolute()
-    if not tex_path.exists():
-        raise FileNotFoundError(f"TeX file not found: {tex_path}")
-
-    working_dir = tex_path.parent
-    pdf_name = f"{tex_path.stem}.pdf"
-    pdf_path = working_dir / pdf_name
-
-    # Clean existing PDF if present
-    if pdf_path.exists():
-        os.remove(pdf_path)
-
-    # Run compilation with explicit output handling
-    commands = [
-        ["pdflatex", "-interaction=nonstopmode", "-halt-on-error",
-         f"-output-directory={working_dir}", tex_path.name],
-        ["pdflatex", "-interaction=nonstopmode", "-halt-on-error",
-         f"-output-directory={working_dir}", tex_path.name]
-    ]
-
-    for cmd in commands:
-        process = subprocess.run(
-            cmd,
-            cwd=str(working_dir),
-            capture_output=True,
-            text=True
-        )
-        if process.returncode != 0:
-            error_log = process.stderr or process.stdout
-            raise RuntimeError(f"LaTeX Error:\n{error_log}")
-
-    if not pdf_path.exists():
-        raise RuntimeError(f"PDF generation failed. Expected at: {pdf_path}")
-    
-    return str(pdf_path)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+import subprocess
+import os
+import re
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from instrumentation import span, incr
+
+# Precompiled preamble formats, shared by every build
+FORMAT_DIR = Path(__file__).parent / 'outputs' / '.formats'
+
+# pdflatex is never run more than this many times per document
+MAX_PASSES = 2
+
+RERUN_PATTERN = re.compile(
+    r'Rerun to get|Label\(s\) may have changed|Please rerun LaTeX|rerunfilecheck Warning'
+)
+BEGIN_DOCUMENT = '\\begin{document}'
+# .aux entries that change what the next pass typesets. LaTeX and hyperref also
+# write fixed definitions into every .aux, which a rerun cannot change.
+AUX_STATE_PATTERN = re.compile(r'^\\(?:newlabel|@writefile|bibcite|@input)\b.*$', re.M)
+
+_format_lock = threading.Lock()
+_failed_formats = set()
+
+
+@dataclass
+class CompileResult:
+    pdf_path: str
+    format_name: str = None
+    format_seconds: float = 0.0
+    pass_seconds: list = field(default_factory=list)
+
+    @property
+    def passes(self):
+        return len(self.pass_seconds)
+
+    @property
+    def total_seconds(self):
+        return self.format_seconds + sum(self.pass_seconds)
+
+
+def _aux_state(path):
+    """The cross-reference entries of an .aux file; a missing file reads as empty."""
+    try:
+        text = path.read_text(errors='replace')
+    except FileNotFoundError:
+        text = ''
+    return hashlib.sha256('\n'.join(AUX_STATE_PATTERN.findall(text)).encode('utf-8')).hexdigest()
+
+
+def _format_env():
+    # A trailing separator keeps kpathsea's default format search path
+    env = os.environ.copy()
+    env['TEXFORMATS'] = f"{FORMAT_DIR}{os.pathsep}{env.get('TEXFORMATS', '')}"
+    return env
+
+
+def ensure_format(tex_path):
+    """
+    Dump everything before \\begin{document} into a pdflatex format file
+    (via mylatexformat) and return its name, or None if it cannot be built.
+
+    Formats are keyed by a hash of the preamble, so every resume rendered from
+    the same template shares one format.
+    """
+    source = Path(tex_path).read_text()
+    index = source.find(BEGIN_DOCUMENT)
+    if index < 0:
+        return None
+    preamble = source[:index]
+    name = f"preamble_{hashlib.sha256(preamble.encode('utf-8')).hexdigest()[:16]}"
+    if (FORMAT_DIR / f"{name}.fmt").exists():
+        return name
+    if name in _failed_formats:
+        return None
+
+    with _format_lock:
+        if (FORMAT_DIR / f"{name}.fmt").exists():
+            return name
+        FORMAT_DIR.mkdir(exist_ok=True, parents=True)
+        with tempfile.TemporaryDirectory(dir=FORMAT_DIR) as build_dir:
+            build_dir = Path(build_dir)
+            (build_dir / f"{name}.tex").write_text(
+                f"{preamble}{BEGIN_DOCUMENT}\n\\end{{document}}\n")
+            process = subprocess.run(
+                ["pdflatex", "-ini", "-interaction=nonstopmode", "-halt-on-error",
+                 f"-jobname={name}", "&pdflatex", "mylatexformat.ltx", f"{name}.tex"],
+                cwd=str(build_dir),
+                capture_output=True,
+                text=True
+            )
+            built = build_dir / f"{name}.fmt"
+            if process.returncode != 0 or not built.exists():
+                logging.warning(f"Could not build LaTeX format {name}, using cold compiles")
+                _failed_formats.add(name)
+                return None
+            # Atomic so that concurrent builds never see a partial format
+            os.replace(built, FORMAT_DIR / f"{name}.fmt")
+    return name
+
+
+def _needs_rerun(aux_before, aux_after, log_path):
+    if aux_before != aux_after:
+        return True
+    try:
+        log_text = log_path.read_text(errors='replace')
+    except FileNotFoundError:
+        return False
+    return bool(RERUN_PATTERN.search(log_text))
+
+
+def compile_tex(tex_file_path, use_format=True):
+    """
+    Compiles a .tex file to PDF and returns a CompileResult with per-pass timing.
+
+    The fixed preamble is loaded from a precompiled format when possible, and
+    the second pdflatex pass only runs when the .aux file changed or LaTeX asked
+    for a rerun.
+    """
+    tex_path = Path(tex_file_path).absolute()
+    if not tex_path.exists():
+        raise FileNotFoundError(f"TeX file not found: {tex_path}")
+
+    working_dir = tex_path.parent
+    pdf_path = working_dir / f"{tex_path.stem}.pdf"
+    aux_path = working_dir / f"{tex_path.stem}.aux"
+    log_path = working_dir / f"{tex_path.stem}.log"
+
+    # Clean existing PDF if present
+    if pdf_path.exists():
+        os.remove(pdf_path)
+
+    result = CompileResult(pdf_path=str(pdf_path))
+    if use_format and shutil.which("pdflatex"):
+        start = time.perf_counter()
+        with span('latex_format'):
+            result.format_name = ensure_format(tex_path)
+        result.format_seconds = time.perf_counter() - start
+
+    cmd = ["pdflatex", "-interaction=nonstopmode", "-halt-on-error",
+           f"-output-directory={working_dir}"]
+    env = None
+    if result.format_name:
+        cmd.append(f"-fmt={result.format_name}")
+        env = _format_env()
+    cmd.append(tex_path.name)
+
+    for pass_number in range(1, MAX_PASSES + 1):
+        aux_before = _aux_state(aux_path)
+        start = time.perf_counter()
+        with span(f'pdflatex_pass{pass_number}'):
+            process = subprocess.run(
+                cmd,
+                cwd=str(working_dir),
+                capture_output=True,
+                text=True,
+                env=env
+            )
+        result.pass_seconds.append(time.perf_counter() - start)
+        if process.returncode != 0:
+            incr('resume_pdflatex_failures_total', fmt='warm' if result.format_name else 'cold')
+            if result.format_name:
+                # Retry cold; a document error fails that too and says nothing about the format
+                logging.warning(f"Compile with format {result.format_name} failed, retrying cold")
+                cold = compile_tex(tex_path, use_format=False)
+                # The cold build worked, so the format is stale or incompatible
+                logging.warning(f"Discarding LaTeX format {result.format_name}")
+                _failed_formats.add(result.format_name)
+                (FORMAT_DIR / f"{result.format_name}.fmt").unlink(missing_ok=True)
+                return cold
+            error_log = process.stderr or process.stdout
+            raise RuntimeError(f"LaTeX Error:\n{error_log}")
+        if not _needs_rerun(aux_before, _aux_state(aux_path), log_path):
+            break
+
+    if not pdf_path.exists():
+        raise RuntimeError(f"PDF generation failed. Expected at: {pdf_path}")
+
+    logging.debug(
+        f"Compiled {tex_path.name} in {result.total_seconds:.2f}s "
+        f"({result.passes} passes, format={result.format_name})"
+    )
+    return result
+
+
+def tex_to_pdf(tex_file_path):
+    """
+    Converts a .tex file to PDF with explicit path handling and validation
+    """
+    return compile_tex(tex_file_path).pdf_path
@@ -0,0 +1,298 @@
+"""
+Pure-Python draft PDF renderer for the builder.
+
+Lays out a Resume with the same sections and geometry as autoCV_template.tex
+(A4, geometry scale 0.9, 12pt base size) using the standard Helvetica fonts,
+and writes the PDF directly. It is an approximation of the pdflatex output,
+close enough to preview line wrapping and page breaks in milliseconds;
+pdflatex remains the renderer for the final download. The template's
+Publications section comes from citations.bib and is not drawn.
+"""
+from datetime import date
+
+from resume_model import Resume
+
+PAGE_WIDTH, PAGE_HEIGHT = 595.28, 841.89  # A4 in points
+# geometry scale=0.9: the text block is 90% of the page in each direction
+MARGIN_X = PAGE_WIDTH * 0.05
+MARGIN_Y = PAGE_HEIGHT * 0.05
+TEXT_WIDTH = PAGE_WIDTH - 2 * MARGIN_X
+
+BASE_SIZE = 12
+NAME_SIZE = 24.88       # \Huge at 12pt
+SECTION_SIZE = 17.28    # \Large at 12pt
+FOOTNOTE_SIZE = 10
+LEADING = 1.2
+COLUMN_GAP = 12         # two \tabcolsep
+ITEM_INDENT = BASE_SIZE  # leftmargin=1em
+SECTION_SPACE = 10      # \titlespacing before and after
+LINK_COLOUR = (0, 0.2, 0.6)
+
+REGULAR, BOLD = 'F1', 'F2'
+FONTS = {REGULAR: 'Helvetica', BOLD: 'Helvetica-Bold'}
+
+# Standard 14 font metrics (1/1000 em) for WinAnsi codes 32-126
+_WIDTHS = {
+    REGULAR: [
+        278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+        1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+        333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+        556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+    ],
+    BOLD: [
+        278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+        556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+        975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+        667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+        333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+        611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+    ],
+}
+DEFAULT_WIDTH = 556  # accented and other non-ASCII characters
+
+
+def text_width(text, font=REGULAR, size=BASE_SIZE):
+    widths = _WIDTHS[font]
+    total = 0
+    for char in text:
+        code = ord(char) - 32
+        total += widths[code] if 0 <= code < len(widths) else DEFAULT_WIDTH
+    return total * size / 1000
+
+
+def wrap(text, width, font=REGULAR, size=BASE_SIZE):
+    """Greedy word wrap to ``width`` points; words longer than a line are split."""
+    lines, current = [], ''
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if text_width(candidate, font, size) <= width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+        while text_width(word, font, size) > width:
+            cut = max(1, int(len(word) * width / text_width(word, font, size)))
+            while cut > 1 and text_width(word[:cut], font, size) > width:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+        current = word
+    if current:
+        lines.append(current)
+    return lines
+
+
+class Row:
+    """One line of output: its height and the text, links and rules drawn in it."""
+
+    def __init__(self, height):
+        self.height = height
+        self.items = []
+
+    def text(self, x, text, font=REGULAR, size=BASE_SIZE, colour=None, link=None):
+        self.items.append(('text', x, text, font, size, colour))
+        if link:
+            self.items.append(('link', x, text_width(text, font, size), size, link))
+        return self
+
+    def rule(self):
+        self.items.append(('rule',))
+        return self
+
+
+def _text_row(text, x=0, font=REGULAR, size=BASE_SIZE):
+    return Row(size * LEADING).text(x, text, font, size)
+
+
+def _paragraph(text, x=0, width=TEXT_WIDTH, font=REGULAR, size=BASE_SIZE):
+    return [_text_row(line, x, font, size) for line in wrap(text, width - x, font, size)]
+
+
+def _table(rows):
+    """Two-column table like ``@{}l X@{}``: left cells size the first column."""
+    left = max((text_width(label) for label, _ in rows), default=0)
+    out = []
+    for label, value in rows:
+        lines = wrap(value, TEXT_WIDTH - left - COLUMN_GAP) or ['']
+        out.append(Row(BASE_SIZE * LEADING).text(0, label).text(left + COLUMN_GAP, lines[0]))
+        out += [_text_row(line, left + COLUMN_GAP) for line in lines[1:]]
+    return out
+
+
+def _blocks(resume, today):
+    """
+    The document as (rows, keep_together) blocks in template order. Like the
+    template's tabularx environments, entries and tables never split across
+    pages; a section heading is kept with the block after it.
+    """
+    info = resume.personal_info
+    header = [Row(NAME_SIZE * LEADING).text((TEXT_WIDTH - text_width(info.name, size=NAME_SIZE)) / 2,
+                                            info.name, size=NAME_SIZE)]
+    contacts = [(label, url) for label, url in (
+        ('GitHub', info.github), ('LinkedIn', info.linkedin),
+        (info.email, f"mailto:{info.email}" if info.email else ''),
+        (info.phone, f"tel:{info.phone}" if info.phone else ''),
+    ) if url]
+    if contacts:
+        gap = text_width('    ')
+        total = sum(text_width(label) for label, _ in contacts) + gap * (len(contacts) - 1)
+        row, x = Row(BASE_SIZE * LEADING), (TEXT_WIDTH - total) / 2
+        for label, url in contacts:
+            row.text(x, label, colour=LINK_COLOUR, link=url)
+            x += text_width(label) + gap
+        header.append(row)
+    yield header, True
+
+    def heading(title):
+        return ('heading', [Row(SECTION_SPACE), _text_row(title, size=SECTION_SIZE).rule(),
+                            Row(SECTION_SPACE)])
+
+    yield heading('Summary')
+    yield _paragraph(resume.summary), False
+
+    yield heading('Work Experience')
+    for exp in resume.experience:
+        rows = [Row(BASE_SIZE * LEADING + 3.75)
+                .text(0, exp.title, BOLD)
+                .text(text_width(exp.title + ' ', BOLD), f"at {exp.company}")
+                .text(TEXT_WIDTH - text_width(exp.duration), exp.duration)]
+        rows += _paragraph(exp.description)
+        for item in exp.responsibilities:
+            lines = _paragraph(item, x=ITEM_INDENT)
+            if lines:
+                lines[0].text(0, '–')
+            rows += lines
+        yield rows, True
+
+    yield heading('Projects')
+    for project in resume.projects:
+        row = Row(BASE_SIZE * LEADING + 3.75).text(0, project.name, BOLD)
+        if project.link:
+            row.text(TEXT_WIDTH - text_width('Link'), 'Link', colour=LINK_COLOUR, link=project.link)
+        yield [row] + _paragraph(project.description), True
+
+    yield heading('Education')
+    yield _table([(edu.year, f"{edu.degree} at {edu.institution}"
+                   + (f" (GPA: {edu.gpa})" if edu.gpa else '')) for edu in resume.education]), True
+
+    yield heading('Skills')
+    yield _table([(group.title, ', '.join(group.skills)) for group in resume.skills]), True
+
+    footer = f"Last updated: {today.strftime('%B %d, %Y').replace(' 0', ' ')}"
+    yield 'footer', [_text_row(footer, (TEXT_WIDTH - text_width(footer, size=FOOTNOTE_SIZE)) / 2,
+                               size=FOOTNOTE_SIZE)]
+
+
+def paginate(resume, today=None):
+    """Place rows on pages; returns a list of pages, each a list of (top_y, Row)."""
+    body_height = PAGE_HEIGHT - 2 * MARGIN_Y
+    pages, y = [[]], 0.0
+    pending_heading = []
+
+    def place(rows):
+        nonlocal y
+        for row in rows:
+            if y + row.height > body_height and pages[-1]:
+                pages.append([])
+                y = 0.0
+            pages[-1].append((y, row))
+            y += row.height
+
+    for first, second in _blocks(resume, today or date.today()):
+        if first == 'heading':
+            pending_heading = second
+            continue
+        if first == 'footer':
+            # \vfill pushes the footer to the bottom of the last page
+            rows_height = sum(row.height for row in second)
+            if y + rows_height > body_height:
+                pages.append([])
+            y = body_height - rows_height
+            place(second)
+            continue
+        rows, keep = first, second
+        leading = sum(row.height for row in pending_heading)
+        needed = leading + (sum(row.height for row in rows) if keep else
+                            (rows[0].height if rows else 0))
+        if y + needed > body_height and needed <= body_height and pages[-1]:
+            pages.append([])
+            y = 0.0
+        place(pending_heading)
+        pending_heading = []
+        place(rows)
+    return pages
+
+
+def _pdf_string(text):
+    data = text.encode('cp1252', 'replace')
+    return b'(' + data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _page_content(placed):
+    """Content stream operators and link annotations for one page."""
+    ops, links = [], []
+    for top, row in placed:
+        baseline = PAGE_HEIGHT - MARGIN_Y - top - row.height * 0.8
+        for item in row.items:
+            if item[0] == 'text':
+                _, x, text, font, size, colour = item
+                colour_op = '%.3g %.3g %.3g rg' % (colour or (0, 0, 0))
+                ops.append(f"BT {colour_op} /{font} {size:.2f} Tf {MARGIN_X + x:.2f} {baseline:.2f} Td "
+                           .encode('ascii') + _pdf_string(text) + b" Tj ET")
+            elif item[0] == 'link':
+                _, x, width, size, url = item
+                links.append(((MARGIN_X + x, baseline - size * 0.2,
+                               MARGIN_X + x + width, baseline + size * 0.8), url))
+            elif item[0] == 'rule':
+                rule_y = baseline - row.height * 0.25
+                ops.append(f"0.4 w {MARGIN_X:.2f} {rule_y:.2f} m {MARGIN_X + TEXT_WIDTH:.2f} "
+                           f"{rule_y:.2f} l S".encode('ascii'))
+    return b'\n'.join(ops), links
+
+
+def write_pdf(pages):
+    """Serialize paginated rows into PDF bytes."""
+    objects = [None, None] + [
+        f"<< /Type /Font /Subtype /Type1 /BaseFont /{name} /Encoding /WinAnsiEncoding >>".encode('ascii')
+        for name in FONTS.values()
+    ]
+    font_refs = ' '.join(f"/{key} {index} 0 R" for index, key in enumerate(FONTS, start=3))
+    page_ids = []
+    for placed in pages:
+        stream, links = _page_content(placed)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        annot_ids = []
+        for (x1, y1, x2, y2), url in links:
+            objects.append(f"<< /Type /Annot /Subtype /Link /Rect [{x1:.2f} {y1:.2f} {x2:.2f} {y2:.2f}] "
+                           f"/Border [0 0 0] /A << /S /URI /URI ".encode('ascii')
+                           + _pdf_string(url) + b" >> >>")
+            annot_ids.append(len(objects))
+        annots = f" /Annots [{' '.join(f'{i} 0 R' for i in annot_ids)}]" if annot_ids else ''
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                       f"/Contents {content_id} 0 R /Resources << /Font << {font_refs} >> >>{annots} >>"
+                       .encode('ascii'))
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = (f"<< /Type /Pages /Count {len(page_ids)} /Kids ["
+                  + ' '.join(f"{i} 0 R" for i in page_ids) + "] >>").encode('ascii')
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b''.join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def render_draft_pdf(data, today=None):
+    """Draft PDF bytes for a Resume (or builder form data)."""
+    resume = data if isinstance(data, Resume) else Resume.from_form(data)
+    return write_pdf(paginate(resume, today))
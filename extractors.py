@@ -0,0 +1,343 @@
+import re
+import json
+import math
+import asyncio
+import logging
+from llm_client import LLMError
+from instrumentation import incr
+
+# Top-level fields of the parser output and the shape the model must return
+RESUME_SCHEMA = {
+    "personal_info": {
+        "full_name": "string",
+        "email_id": "string",
+        "phone": "string or null",
+        "location": "string or null",
+        "github_portfolio": "string or null",
+        "linkedin_id": "string or null"
+    },
+    "professional_summary": "string or null",
+    "employment_details": [{
+        "company": "string",
+        "title": "string",
+        "duration": "string",
+        "responsibilities": ["string"],
+        "achievements": ["string"]
+    }],
+    "education": [{
+        "degree": "string",
+        "institution": "string",
+        "year": "string",
+        "gpa": "string or null"
+    }],
+    "projects": [{
+        "name": "string",
+        "description": "string",
+        "technologies": ["string"],
+        "link": "string or null"
+    }],
+    "technical_skills": ["string"],
+    "soft_skills": ["string"],
+    "certifications": [{
+        "name": "string",
+        "organization": "string",
+        "date": "string or null"
+    }],
+    "extracted_links": ["string"]
+}
+
+PROMPT_HEADER = ("You are an expert ATS (Applicant Tracking System) parser. Extract and return ONLY "
+                 "the following information in the exact structure specified:")
+PROMPT_FOOTER = "Ensure all arrays are empty lists [] if no data is found, not null."
+
+
+def schema_prompt(fields=None):
+    """Extraction prompt for all schema fields, or only for ``fields``."""
+    schema = {key: value for key, value in RESUME_SCHEMA.items() if fields is None or key in fields}
+    # Minified: indentation would only cost input tokens
+    return f"{PROMPT_HEADER}\n{json.dumps(schema, separators=(',', ':'))}\n{PROMPT_FOOTER}"
+
+
+def parse_model_json(text):
+    """Decode a JSON model response, tolerating ```json fences."""
+    clean_response = text.strip()
+    if clean_response.startswith('```json'):
+        clean_response = clean_response[7:]
+    if clean_response.endswith('```'):
+        clean_response = clean_response[:-3]
+    return json.loads(clean_response.strip())
+
+
+class ExtractorBackend:
+    """
+    Turns resume text and links into the RESUME_SCHEMA structure.
+    ``extract`` returns the parsed dict, or {"error": ..., "details": ...}.
+    """
+    name = 'base'
+
+    def extract(self, resume_text, links):
+        raise NotImplementedError
+
+    async def extract_async(self, resume_text, links):
+        """Async ``extract``; backends without native async support run in a thread."""
+        return await asyncio.to_thread(self.extract, resume_text, links)
+
+
+def _call_error(error):
+    """Error result for a failed Gemini call; unavailability carries a retry hint."""
+    result = {"error": "Failed to process resume", "details": str(error)}
+    if isinstance(error, LLMError):
+        result["error"] = "The resume service is busy, please try again shortly"
+        result["retry_after"] = math.ceil(error.retry_after or 5)
+    return result
+
+
+class GeminiExtractor(ExtractorBackend):
+    """Sends the resume (or part of it) to Gemini through an llm_client.LLMClient."""
+    name = 'gemini'
+
+    def __init__(self, client):
+        self.client = client
+
+    def _prompt(self, resume_text, links, fields):
+        return (f"{schema_prompt(fields)}\nResume:\n{resume_text}\n"
+                f"Links: {json.dumps(list(links))}")
+
+    def _parse(self, call, response):
+        try:
+            return parse_model_json(response.text)
+        except json.JSONDecodeError as e:
+            incr('resume_llm_failures_total', call=call, reason='invalid_response')
+            return {"error": "Failed to parse resume data", "details": str(e)}
+
+    def extract(self, resume_text, links, fields=None):
+        call = 'extract' if fields is None else 'extract_fields'
+        try:
+            response = self.client.generate(self._prompt(resume_text, links, fields), call)
+        except Exception as e:
+            return _call_error(e)
+        return self._parse(call, response)
+
+    async def extract_async(self, resume_text, links, fields=None):
+        call = 'extract' if fields is None else 'extract_fields'
+        try:
+            response = await self.client.generate_async(
+                self._prompt(resume_text, links, fields), call)
+        except Exception as e:
+            return _call_error(e)
+        return self._parse(call, response)
+
+
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE_PATTERN = re.compile(r'(?<!\w)\+?\d[\d\s().-]{7,}\d(?!\w)')
+URL_PATTERN = re.compile(r'(?:https?://|www\.)[^\s,;()<>]+|(?:github|linkedin)\.com/[^\s,;()<>]+',
+                         re.IGNORECASE)
+NAME_PATTERN = re.compile(r"^[A-Z][A-Za-z'.-]+(?: [A-Z][A-Za-z'.-]*){1,3}$")
+SKILL_SPLIT_PATTERN = re.compile(r'\s*[,|•·;▪●]\s*|\s{3,}')
+BULLET_PREFIX = re.compile(r'^[\s•·▪●*–-]+')
+
+SECTION_ALIASES = {
+    'professional_summary': ['summary', 'professional summary', 'profile', 'objective',
+                             'career objective', 'about me', 'professional profile'],
+    'employment_details': ['experience', 'work experience', 'professional experience',
+                           'employment', 'employment history', 'work history', 'internships',
+                           'internship'],
+    'education': ['education', 'academic background', 'academics', 'academic qualifications',
+                  'qualifications'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects'],
+    'technical_skills': ['skills', 'technical skills', 'skills summary', 'core competencies',
+                         'technologies', 'tech stack', 'skills & tools', 'skills and tools'],
+    'soft_skills': ['soft skills', 'interpersonal skills'],
+    'certifications': ['certifications', 'certificates', 'licenses & certifications',
+                       'licenses and certifications', 'courses'],
+}
+HEADING_TO_FIELD = {alias: field for field, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+# Fields the heuristic pass only locates; their content is left to the LLM
+STRUCTURED_FIELDS = ('employment_details', 'education', 'projects', 'certifications')
+
+
+def find_sections(lines):
+    """
+    Locate section headings. Returns {field: (start, end)} line ranges of the
+    section bodies, in document order.
+    """
+    headings = []
+    for index, line in enumerate(lines):
+        key = re.sub(r'[^a-z& ]', '', line.strip().lower()).strip()
+        if key in HEADING_TO_FIELD and len(line.strip()) < 40:
+            field = HEADING_TO_FIELD[key]
+            if field not in (h[0] for h in headings):
+                headings.append((field, index))
+    sections = {}
+    for position, (field, start) in enumerate(headings):
+        end = headings[position + 1][1] if position + 1 < len(headings) else len(lines)
+        sections[field] = (start + 1, end)
+    return sections
+
+
+def _split_skills(lines):
+    skills = []
+    for line in lines:
+        line = BULLET_PREFIX.sub('', line).strip()
+        if ':' in line:
+            line = line.split(':', 1)[1]  # drop "Languages:"-style labels
+        for item in SKILL_SPLIT_PATTERN.split(line):
+            item = item.strip(' .')
+            if 1 <= len(item) <= 40 and item not in skills:
+                skills.append(item)
+    return skills
+
+
+class HeuristicExtractor(ExtractorBackend):
+    """
+    Offline rule-based extractor. Fills contact details, links, summary,
+    skills and section boundaries with regexes, and reports the fields it
+    could not resolve confidently in ``unresolved``.
+    """
+    name = 'heuristic'
+
+    def analyze(self, resume_text, links):
+        """Return (data, unresolved_fields, sections, lines)."""
+        lines = resume_text.splitlines()
+        sections = find_sections(lines)
+        first_section = min((start for start, _ in sections.values()), default=len(lines))
+        header = [line.strip() for line in lines[:max(first_section - 1, 0)] if line.strip()]
+
+        found_links = list(dict.fromkeys(list(links) + URL_PATTERN.findall(resume_text)))
+        email = EMAIL_PATTERN.search(resume_text)
+        phone = PHONE_PATTERN.search('\n'.join(header) or resume_text)
+        github = next((l for l in found_links if 'github.com' in l.lower()), None)
+        linkedin = next((l for l in found_links if 'linkedin.com' in l.lower()), None)
+        name = next((line for line in (header or lines[:5]) if NAME_PATTERN.match(line.strip())), None)
+
+        data = {field: [] for field in RESUME_SCHEMA if isinstance(RESUME_SCHEMA[field], list)}
+        data['personal_info'] = {
+            "full_name": name.strip() if name else None,
+            "email_id": email.group(0) if email else None,
+            "phone": phone.group(0).strip() if phone else None,
+            "location": None,
+            "github_portfolio": github,
+            "linkedin_id": linkedin,
+        }
+        data['professional_summary'] = None
+        data['extracted_links'] = found_links
+        unresolved = []
+        # With a recognisable layout, a missing heading means a missing section
+        structured_layout = len(sections) >= 2
+
+        # Location has no reliable pattern, so the LLM reads it from the header
+        if not (name and email and data['personal_info']['location']):
+            unresolved.append('personal_info')
+
+        if 'professional_summary' in sections:
+            start, end = sections['professional_summary']
+            summary = ' '.join(line.strip() for line in lines[start:end] if line.strip())
+            data['professional_summary'] = summary or None
+        elif not structured_layout:
+            unresolved.append('professional_summary')
+
+        for field in ('technical_skills', 'soft_skills'):
+            if field in sections:
+                start, end = sections[field]
+                data[field] = _split_skills(lines[start:end])
+            elif field == 'soft_skills' and structured_layout:
+                continue
+            if not data[field]:
+                unresolved.append(field)
+
+        for field in STRUCTURED_FIELDS:
+            if field in sections or not structured_layout:
+                unresolved.append(field)
+
+        return data, unresolved, sections, lines
+
+    def extract(self, resume_text, links):
+        return self.analyze(resume_text, links)[0]
+
+
+class HybridExtractor(ExtractorBackend):
+    """
+    Runs the heuristic extractor first and asks the LLM only for the fields it
+    left unresolved. When those fields map to detected sections, only that
+    part of the resume is sent.
+
+    The heuristics never fill the structured sections (STRUCTURED_FIELDS) or
+    the location, so almost every resume still costs one Gemini call; what
+    hybrid saves is input and output tokens, not calls. If that call fails,
+    the heuristic result is returned with a ``partial`` entry describing the
+    error and the fields that are missing.
+    """
+    name = 'hybrid'
+
+    def __init__(self, llm, heuristic=None):
+        self.llm = llm
+        self.heuristic = heuristic or HeuristicExtractor()
+
+    def _plan(self, resume_text, links):
+        """Heuristic pass; returns (data, unresolved fields, text to send the LLM)."""
+        data, unresolved, sections, lines = self.heuristic.analyze(resume_text, links)
+        # Line ranges holding each unresolved field: its section (with the
+        # heading), or the header above the first section for personal_info
+        header_end = min((start - 1 for start, _ in sections.values()), default=0)
+        ranges = []
+        for field in unresolved:
+            if field in sections:
+                start, end = sections[field]
+                ranges.append((start - 1, end))
+            elif field == 'personal_info' and header_end > 0:
+                ranges.append((0, header_end))
+            else:
+                ranges = None
+                break
+        context = resume_text
+        if unresolved and ranges:
+            context = '\n'.join('\n'.join(lines[start:end]) for start, end in sorted(ranges))
+        if unresolved:
+            logging.debug(f"Heuristic extractor left {unresolved} unresolved; asking {self.llm.name}")
+        return data, unresolved, context
+
+    def _merge(self, data, unresolved, llm_data):
+        if 'error' in llm_data:
+            # Degrade to what the heuristics found rather than failing the parse
+            logging.warning(f"{self.llm.name} extraction failed, returning heuristic data "
+                            f"without {unresolved}: {llm_data['error']}")
+            data['partial'] = dict(llm_data, unresolved=unresolved)
+            return data
+        for field in unresolved:
+            if field == 'personal_info' and isinstance(llm_data.get(field), dict):
+                # Keep what the heuristics found; the LLM fills the gaps
+                found = {key: value for key, value in data[field].items() if value}
+                data[field] = dict(llm_data[field], **found)
+            elif field in llm_data:
+                data[field] = llm_data[field]
+        return data
+
+    def extract(self, resume_text, links):
+        data, unresolved, context = self._plan(resume_text, links)
+        if not unresolved:
+            return data
+        llm_data = self.llm.extract(context, data['extracted_links'], fields=unresolved)
+        return self._merge(data, unresolved, llm_data)
+
+    async def extract_async(self, resume_text, links):
+        # The heuristic pass is a few milliseconds of CPU; only the LLM call is awaited
+        data, unresolved, context = self._plan(resume_text, links)
+        if not unresolved:
+            return data
+        llm_data = await self.llm.extract_async(context, data['extracted_links'], fields=unresolved)
+        return self._merge(data, unresolved, llm_data)
+
+
+EXTRACTOR_BACKENDS = ('gemini', 'heuristic', 'hybrid')
+
+
+def make_extractor(name, client=None):
+    """Build the configured backend; 'gemini' and 'hybrid' need an LLMClient."""
+    if name == 'heuristic':
+        return HeuristicExtractor()
+    if name == 'gemini':
+        return GeminiExtractor(client)
+    if name == 'hybrid':
+        return HybridExtractor(GeminiExtractor(client))
+    raise ValueError(f"Unknown extractor backend {name!r}; expected one of {EXTRACTOR_BACKENDS}")
@@ -0,0 +1,160 @@
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_HISTOGRAM = 'resume_stage_duration_seconds'
+
+# Events (spans and counter increments) recorded in the current request or job
+_events = ContextVar('instrumentation_events', default=None)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+class MetricsRegistry:
+    """Thread-safe counters, histograms and callback gauges in Prometheus form."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = {}    # name -> {label_key: value}
+        self._histograms = {}  # name -> (buckets, {label_key: [bucket counts..., sum, count]})
+        self._collectors = []  # callables returning [(name, type, help, labels, value)]
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def incr(self, name, amount=1, **labels):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        with self._lock:
+            bounds, series = self._histograms.setdefault(name, (buckets, {}))
+            state = series.setdefault(_label_key(labels), [0] * len(bounds) + [0.0, 0])
+            for index, bound in enumerate(bounds):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def register_collector(self, collector):
+        """``collector()`` returns (name, type, help, labels, value) samples at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self):
+        """Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+            for name, (bounds, series) in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, state in sorted(series.items()):
+                    for bound, count in zip(bounds, state):
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', bound),))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-2]}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+        # Samples of one metric must be contiguous in the exposition
+        collected = {}
+        for collector in self._collectors:
+            for name, metric_type, help_text, labels, value in collector():
+                header = (f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}")
+                collected.setdefault(name, (header, []))[1].append(
+                    f"{name}{_format_labels(_label_key(labels))} {value}")
+        for header, samples in collected.values():
+            lines.extend(header)
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+registry.describe(STAGE_HISTOGRAM, "Duration of individual request and build stages.")
+
+
+def _record(event):
+    events = _events.get()
+    if events is not None:
+        events.append(event)
+
+
+@contextmanager
+def span(stage):
+    """Time a block as ``stage``: feeds the stage histogram and Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        registry.observe(STAGE_HISTOGRAM, duration, stage=stage)
+        _record(('span', stage, duration, {}))
+
+
+def incr(name, amount=1, **labels):
+    registry.incr(name, amount, **labels)
+    _record(('count', name, amount, labels))
+
+
+@contextmanager
+def collecting():
+    """
+    Collect the spans and counter increments recorded inside the block into
+    a picklable list, e.g. to ship them back from a worker process.
+    """
+    events = []
+    token = _events.set(events)
+    try:
+        yield events
+    finally:
+        _events.reset(token)
+
+
+def replay(events):
+    """Apply events collected in another process to this process's registry."""
+    for kind, name, value, labels in events:
+        if kind == 'span':
+            registry.observe(STAGE_HISTOGRAM, value, stage=name)
+        else:
+            registry.incr(name, value, **labels)
+        _record((kind, name, value, labels))
+
+
+def start_request():
+    return _events.set([])
+
+
+def finish_request(token):
+    """Stop collecting for the request; returns its [(stage, seconds)] spans."""
+    events = _events.get() or []
+    _events.reset(token)
+    return [(name, value) for kind, name, value, _ in events if kind == 'span']
+
+
+def server_timing(spans, total=None):
+    """Format spans as a Server-Timing header value (durations in ms)."""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in spans]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(entries)
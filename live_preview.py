@@ -0,0 +1,69 @@
+import json
+import hashlib
+from pathlib import Path
+from dataclasses import asdict
+from flask import get_template_attribute
+
+SECTIONS_TEMPLATE = 'preview_sections.html'
+SECTIONS_TEMPLATE_PATH = Path(__file__).parent / 'templates' / SECTIONS_TEMPLATE
+
+_template_digest = (None, None)  # (mtime, sha256 prefix) of the sections template
+
+
+def preview_sections(resume):
+    """
+    Split a Resume into preview sections, in display order.
+    Returns (section_id, macro_name, args) tuples; each experience entry is
+    its own section so editing one job only re-renders that job.
+    """
+    sections = [
+        ('personal', 'personal_info', (resume.personal_info,)),
+        ('summary', 'summary', (resume.summary,)),
+        ('experience', 'experience_heading', ()),
+    ]
+    for index, exp in enumerate(resume.experience):
+        sections.append((f'experience-{index}', 'experience_item', (exp,)))
+    sections += [
+        ('education', 'education', (resume.education,)),
+        ('projects', 'projects', (resume.projects,)),
+        ('skills', 'skills', (resume.skills,)),
+    ]
+    return sections
+
+
+def template_version():
+    global _template_digest
+    mtime = SECTIONS_TEMPLATE_PATH.stat().st_mtime
+    if _template_digest[0] != mtime:
+        digest = hashlib.sha256(SECTIONS_TEMPLATE_PATH.read_bytes()).hexdigest()[:16]
+        _template_digest = (mtime, digest)
+    return _template_digest[1]
+
+
+def fingerprint(macro_name, args, version=None):
+    # The template version is mixed in so a template change re-renders every fragment
+    payload = json.dumps([version or template_version(), macro_name, args], sort_keys=True,
+                         separators=(',', ':'), default=asdict)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def render_changed_sections(resume, known):
+    """
+    Render only the sections whose fingerprint differs from ``known``
+    (section_id -> fingerprint, as held by the client).
+
+    Returns None when nothing changed, otherwise a dict with the section
+    order, every current fingerprint and the HTML of the changed sections.
+    """
+    order, fingerprints, changed = [], {}, {}
+    version = template_version()
+    for section_id, macro_name, args in preview_sections(resume):
+        order.append(section_id)
+        fingerprints[section_id] = fingerprint(macro_name, args, version)
+        if known.get(section_id) != fingerprints[section_id]:
+            macro = get_template_attribute(SECTIONS_TEMPLATE, macro_name)
+            changed[section_id] = str(macro(*args))
+
+    if not changed and set(known) == set(order):
+        return None
+    return {'order': order, 'fingerprints': fingerprints, 'sections': changed}
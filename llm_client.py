@@ -0,0 +1,381 @@
+"""
+Resilient client for Gemini ``generate_content`` calls.
+
+Every call goes through, in order:
+
+- singleflight: identical (call, prompt) requests already in flight wait for
+  that call's result instead of making their own;
+- a circuit breaker that fails fast after repeated upstream failures;
+- an AIMD concurrency limiter: the limit grows by one per round of fast,
+  successful calls and is cut when calls fail or slow down;
+- a deadline covering queueing, attempts and backoff, with jittered
+  exponential backoff between retries of transient errors.
+
+Token usage is recorded per upstream attempt through token_accounting.
+"""
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import deque
+
+from token_accounting import generate_with_accounting, generate_with_accounting_async
+from instrumentation import incr
+
+DEFAULT_DEADLINE = 30.0      # seconds for the whole call, retries included
+ATTEMPT_TIMEOUT = 15.0       # seconds for one upstream attempt
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+# A call slower than this multiple of the best recent latency signals congestion
+LATENCY_TOLERANCE = 2.0
+DECREASE_FACTOR = 0.75
+LATENCY_WINDOW = 50
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+# HTTP statuses worth retrying (google.api_core exceptions carry them as .code)
+TRANSIENT_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """A Gemini call the client gave up on; ``retry_after`` is a hint in seconds."""
+    retry_after = None
+
+
+class DeadlineExceeded(LLMError, TimeoutError):
+    pass
+
+
+class CircuitOpenError(LLMError):
+    def __init__(self, retry_after):
+        super().__init__(f"Gemini is unavailable after repeated failures; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+def is_transient(exc):
+    """Timeouts, connection errors and retryable HTTP statuses."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    return getattr(exc, 'code', None) in TRANSIENT_STATUS
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit shared by threads and asyncio tasks. A successful
+    call that used a saturated limit adds 1/limit (about one slot per round
+    of calls); a failure or a call slower than LATENCY_TOLERANCE times the
+    best recent latency of the same kind of call multiplies the limit by
+    DECREASE_FACTOR, at most once per best-latency interval. Baselines are
+    kept per call name because extraction and scoring prompts have very
+    different normal latencies.
+    """
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=MIN_CONCURRENCY,
+                 maximum=MAX_CONCURRENCY, tolerance=LATENCY_TOLERANCE):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.in_flight = 0
+        self._latencies = {}  # call name -> recent latencies
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_waiters = []
+
+    def _try_acquire(self):
+        if self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def acquire(self, expires):
+        with self._cond:
+            while not self._try_acquire():
+                remaining = expires - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceeded("Deadline passed waiting for a Gemini concurrency slot")
+                self._cond.wait(remaining)
+
+    async def acquire_async(self, expires):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._try_acquire():
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await asyncio.wait_for(waiter, max(0.0, expires - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("Deadline passed waiting for a Gemini concurrency slot") from None
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def release(self, latency, ok, call=None):
+        """Return a slot. ``ok`` is True/False for success/congestion, None for neither."""
+        with self._cond:
+            saturated = self.in_flight >= int(self.limit)
+            self.in_flight -= 1
+            latencies = self._latencies.setdefault(call, deque(maxlen=LATENCY_WINDOW))
+            if ok:
+                latencies.append(latency)
+                if latency > self.tolerance * min(latencies):
+                    self._decrease(min(latencies))
+                elif saturated:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif ok is False:
+                self._decrease(min(latencies, default=0.0))
+            self._cond.notify_all()
+            for loop, waiter in self._async_waiters:
+                loop.call_soon_threadsafe(_wake, waiter)
+            self._async_waiters.clear()
+
+    def _decrease(self, interval):
+        now = time.monotonic()
+        if now - self._last_decrease < interval:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+        logging.debug(f"LLM concurrency limit lowered to {self.limit:.2f}")
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive transient failures and
+    rejects calls for ``reset_timeout`` seconds; then lets one probe call
+    through (half-open), which closes it on success or re-opens it.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                wait = self._opened_at + self.reset_timeout - time.monotonic()
+                if wait > 0:
+                    raise CircuitOpenError(wait)
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpenError(self.reset_timeout)
+                self._probing = True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logging.info("Gemini circuit closed")
+            self.state, self.failures, self._probing = self.CLOSED, 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logging.warning(f"Gemini circuit opened after {self.failures} failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def record_neutral(self):
+        """The call failed for a non-transient reason; only release a probe."""
+        with self._lock:
+            self._probing = False
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class LLMClient:
+    """
+    Wraps a GenerativeModel. ``generate(prompt, call)`` and
+    ``generate_async(prompt, call)`` return the model response or raise:
+    CircuitOpenError, DeadlineExceeded, or the upstream error once retries
+    are used up.
+    """
+
+    def __init__(self, model, deadline=DEFAULT_DEADLINE, attempt_timeout=ATTEMPT_TIMEOUT,
+                 max_retries=MAX_RETRIES, limiter=None, breaker=None, rng=None):
+        self.model = model
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.max_retries = max_retries
+        self.limiter = limiter or AdaptiveLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self._rng = rng or random.Random()
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._async_flights = {}
+
+    def stats(self):
+        return {
+            'concurrency_limit': self.limiter.limit,
+            'in_flight': self.limiter.in_flight,
+            'circuit_state': self.breaker.state,
+        }
+
+    def _backoff(self, attempt):
+        # Full jitter: spreads retries from many callers over the whole window
+        return self._rng.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    @staticmethod
+    def _key(prompt, call):
+        return call, hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def generate(self, prompt, call, deadline=None):
+        expires = time.monotonic() + (deadline or self.deadline)
+        key = self._key(prompt, call)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            incr('resume_llm_coalesced_total', call=call)
+            if not flight.done.wait(max(0.0, expires - time.monotonic())):
+                raise DeadlineExceeded(f"Deadline passed waiting for a shared {call} call")
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+        try:
+            flight.response = self._call(prompt, call, expires)
+            return flight.response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def generate_async(self, prompt, call, deadline=None):
+        expires = time.monotonic() + (deadline or self.deadline)
+        key = (asyncio.get_running_loop(),) + self._key(prompt, call)
+        task = self._async_flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call_async(prompt, call, expires))
+            self._async_flights[key] = task
+            task.add_done_callback(lambda done: self._flight_done(key, done))
+        else:
+            incr('resume_llm_coalesced_total', call=call)
+        # shield: a cancelled caller does not cancel the call other callers share
+        try:
+            return await asyncio.wait_for(asyncio.shield(task),
+                                          max(0.0, expires - time.monotonic()))
+        except asyncio.TimeoutError:
+            if task.done():
+                return task.result()  # finished as the wait ran out: its own outcome
+            raise DeadlineExceeded(f"Deadline passed waiting for a shared {call} call") from None
+
+    def _flight_done(self, key, task):
+        if self._async_flights.get(key) is task:
+            del self._async_flights[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here so an abandoned failure is not logged
+
+    def _attempt_timeout(self, expires):
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline passed before the Gemini call")
+        return min(remaining, self.attempt_timeout)
+
+    def _after_failure(self, call, error, attempt, expires):
+        """Seconds to back off before the next attempt; raises when giving up."""
+        if not is_transient(error):
+            raise error
+        self.breaker.record_failure()
+        delay = self._backoff(attempt)
+        if attempt >= self.max_retries:
+            raise error
+        if time.monotonic() + delay >= expires:
+            incr('resume_llm_rejected_total', call=call, reason='deadline')
+            raise DeadlineExceeded(f"Deadline passed retrying {call}: {error}") from error
+        incr('resume_llm_retries_total', call=call)
+        logging.debug(f"Retrying {call} in {delay:.2f}s after {type(error).__name__}: {error}")
+        return delay
+
+    def _before_attempt(self, call):
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            incr('resume_llm_rejected_total', call=call, reason='circuit_open')
+            raise
+
+    # The slot is taken and the deadline checked before the breaker admits the
+    # attempt, so a half-open probe is only claimed by a call that will run.
+    # Once admitted, any exit that is neither a success nor a transient
+    # failure (a non-transient error, cancellation) releases the probe.
+
+    def _call(self, prompt, call, expires):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(expires)
+            start, ok = time.monotonic(), None
+            try:
+                timeout = self._attempt_timeout(expires)
+                self._before_attempt(call)
+                try:
+                    response = generate_with_accounting(self.model, prompt, call, timeout=timeout)
+                    ok = True
+                except Exception as e:
+                    ok = False if is_transient(e) else None
+                    error = e
+                finally:
+                    if ok is None:
+                        self.breaker.record_neutral()
+            finally:
+                self.limiter.release(time.monotonic() - start, ok, call)
+            if ok:
+                self.breaker.record_success()
+                return response
+            time.sleep(self._after_failure(call, error, attempt, expires))
+
+    async def _call_async(self, prompt, call, expires):
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire_async(expires)
+            start, ok = time.monotonic(), None
+            try:
+                timeout = self._attempt_timeout(expires)
+                self._before_attempt(call)
+                try:
+                    response = await generate_with_accounting_async(self.model, prompt, call,
+                                                                    timeout=timeout)
+                    ok = True
+                except Exception as e:
+                    ok = False if is_transient(e) else None
+                    error = e
+                finally:
+                    if ok is None:
+                        self.breaker.record_neutral()
+            finally:
+                self.limiter.release(time.monotonic() - start, ok, call)
+            if ok:
+                self.breaker.record_success()
+                return response
+            await asyncio.sleep(self._after_failure(call, error, attempt, expires))
@@ -2,52 +2,92 @@
 import os
 import json
 import uuid
+import hashlib
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date
 from compile_latex import tex_to_pdf
+from render_cache import RenderCache, render_key
+from instrumentation import span
+from resume_model import Resume
 import jinja2
 
 # Use absolute paths for reliability
 UPLOAD_FOLDER = Path(__file__).parent / 'outputs'
 UPLOAD_FOLDER.mkdir(exist_ok=True, parents=True)
 
+# Compiled PDFs are reused when the same TeX is built again
+render_cache = RenderCache(UPLOAD_FOLDER)
+
+LATEX_ESCAPES = str.maketrans({
+    '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+    '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}', '\\': r'\textbackslash{}'
+})
+
 def escape_latex(text):
     if not text:
         return ""
-    return text.translate(str.maketrans({
-        '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
-        '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}',
-        '^': r'\textasciicircum{}', '\\': r'\textbackslash{}'
-    }))
+    return text.translate(LATEX_ESCAPES)
 
-def generate_autocv(data, preview=False):
-    # Build context with LaTeX escaping
+TEMPLATE_PATH = Path(__file__).parent / "autoCV_template.tex"
+
+# Loaded once; auto_reload only recompiles when the template's mtime changes
+(UPLOAD_FOLDER / '.jinja_cache').mkdir(exist_ok=True)
+latex_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(str(TEMPLATE_PATH.parent)),
+    bytecode_cache=jinja2.FileSystemBytecodeCache(str(UPLOAD_FOLDER / '.jinja_cache')),
+    auto_reload=True,
+)
+
+_template_digest = (None, None)  # (mtime, sha256 prefix) of the template file
+
+def warm_up():
+    """Compile the LaTeX template ahead of the first build (pre-fork hook)."""
+    latex_env.get_template(TEMPLATE_PATH.name)
+
+def template_version():
+    global _template_digest
+    mtime = TEMPLATE_PATH.stat().st_mtime
+    if _template_digest[0] != mtime:
+        digest = hashlib.sha256(TEMPLATE_PATH.read_bytes()).hexdigest()[:16]
+        _template_digest = (mtime, digest)
+    # The template prints \today, so the build date is part of the version
+    return f"{_template_digest[1]}:{date.today().isoformat()}"
+
+def render_tex(data):
+    """
+    Render a Resume (or builder form data) into LaTeX source.
+    Returns (tex, cache_key).
+    """
+    resume = data if isinstance(data, Resume) else Resume.from_form(data)
+    # Escaped once for LaTeX; the template only places values
+    resume = resume.escaped(escape_latex)
+    info = resume.personal_info
     context = {
-        'name': escape_latex(data['personal_info']['name']),
-        'email': escape_latex(data['personal_info'].get('email', '')),
-        'phone': escape_latex(data['personal_info'].get('phone', '')),
-        'github': escape_latex(data['personal_info'].get('github', '')),
-        'linkedin': escape_latex(data['personal_info'].get('linkedin', '')),
-        'summary': escape_latex(data.get('summary', '')),
-        'work_experience': data.get('experience', []),
-        'projects': data.get('projects', []),
-        'education': data.get('education', []),
-        'skills': [{'title': key, 'list': data.get('skills', {}).get(key, [])} 
-                  for key in data.get('skills', {})]
+        'name': info.name,
+        'email': info.email,
+        'phone': info.phone,
+        'github': info.github,
+        'linkedin': info.linkedin,
+        'summary': resume.summary,
+        'work_experience': resume.experience,
+        'projects': resume.projects,
+        'education': resume.education,
+        'skills': resume.skills,
     }
-    
-    # Render template
-    template_path = Path(__file__).parent / "autoCV_template.tex"
-    tex_content = jinja2.Template(template_path.read_text()).render(**context)
 
-    if preview:
-        return tex_content
+    with span('jinja_render'):
+        tex_content = latex_env.get_template(TEMPLATE_PATH.name).render(**context)
+    return tex_content, render_key(tex_content, template_version())
 
+def compile_tex_source(tex_content, output_dir=UPLOAD_FOLDER):
+    """Write TeX source into ``output_dir`` and compile it, returning the PDF path."""
+    output_dir = Path(output_dir)
     # Generate unique filename
     file_id = uuid.uuid4().hex[:8]
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f"resume_{timestamp}_{file_id}"
-    tex_path = UPLOAD_FOLDER / f"{filename}.tex"
+    tex_path = output_dir / f"{filename}.tex"
 
     # Save TeX file
     with tex_path.open('w') as f:
@@ -57,21 +97,33 @@ def generate_autocv(data, preview=False):
     try:
         pdf_path = tex_to_pdf(str(tex_path))
         final_pdf = Path(pdf_path)
-        print(pdf_path)
         if not final_pdf.exists():
             raise RuntimeError("PDF generation failed - file not created")
-            
+
         return str(final_pdf.absolute())
         
     except Exception as e:
         # Cleanup failed files
         if tex_path.exists():
             tex_path.unlink()
-        pdf_path = UPLOAD_FOLDER / f"{filename}.pdf"
+        pdf_path = output_dir / f"{filename}.pdf"
         if pdf_path.exists():
             pdf_path.unlink()
         raise
 
+def generate_autocv(data, preview=False):
+    tex_content, cache_key = render_tex(data)
+
+    if preview:
+        return tex_content
+
+    # Reuse a previously compiled PDF for identical input
+    cached_pdf = render_cache.get(cache_key)
+    if cached_pdf:
+        return cached_pdf
+
+    return render_cache.put(cache_key, compile_tex_source(tex_content))
+
 if __name__ == '__main__':
     with open("sample_resume_data.json") as f:
         resume_data = json.load(f)
@@ -0,0 +1,134 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+# Parse results live in their own database next to users.db
+CACHE_DB = Path(__file__).parent / 'parse_cache.db'
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+MAX_ENTRIES = 10000
+
+
+def pdf_digest(pdf_bytes):
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+class ParseCache:
+    """
+    SQLite cache of parser output (extracted JSON, ATS score and its
+    breakdown) keyed by the SHA-256 of the uploaded PDF and the prompt/model
+    version.
+
+    Entries expire after ``ttl`` seconds, and the table is trimmed back to
+    ``max_entries`` by evicting the least recently used rows.
+    """
+
+    def __init__(self, path=CACHE_DB, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES):
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._connection = None
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    @property
+    def _conn(self):
+        # Opened on first use (callers hold self._lock), so importing the app,
+        # or a worker process importing it, doesn't touch the database
+        if self._connection is None:
+            self._connection = self._open()
+        return self._connection
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''CREATE TABLE IF NOT EXISTS parse_results
+                        (pdf_sha256 TEXT, version TEXT, data TEXT, score INTEGER,
+                         created REAL, accessed REAL, hits INTEGER DEFAULT 0,
+                         PRIMARY KEY (pdf_sha256, version))''')
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(parse_results)')}
+        if 'breakdown' not in columns:
+            conn.execute('ALTER TABLE parse_results ADD COLUMN breakdown TEXT')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_parse_results_accessed '
+                     'ON parse_results (accessed)')
+        conn.commit()
+        return conn
+
+    def get(self, pdf_sha256, version):
+        """Return (extracted_data, score, breakdown) for a fresh entry, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, score, created, breakdown FROM parse_results WHERE pdf_sha256 = ? AND version = ?",
+                (pdf_sha256, version)).fetchone()
+            if row is None or now - row[2] > self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE parse_results SET accessed = ?, hits = hits + 1 "
+                "WHERE pdf_sha256 = ? AND version = ?", (now, pdf_sha256, version))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0]), row[1], json.loads(row[3]) if row[3] else None
+
+    def put(self, pdf_sha256, version, extracted_data, score, breakdown=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_results "
+                "(pdf_sha256, version, data, score, breakdown, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (pdf_sha256, version, json.dumps(extracted_data), score,
+                 json.dumps(breakdown) if breakdown is not None else None, now, now))
+            self._trim(now)
+            self._conn.commit()
+
+    def iter_results(self):
+        """Yield (pdf_sha256, extracted_data, score) for every fresh, error-free entry."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pdf_sha256, data, score FROM parse_results WHERE created >= ? "
+                "ORDER BY created", (time.time() - self.ttl,)).fetchall()
+        for pdf_sha256, data, score in rows:
+            data = json.loads(data)
+            if 'error' not in data:
+                yield pdf_sha256, data, score
+
+    def bypass(self):
+        """Record a lookup that was skipped because the caller asked for a fresh parse."""
+        with self._lock:
+            self.bypassed += 1
+
+    def _trim(self, now):
+        cursor = self._conn.execute(
+            "DELETE FROM parse_results WHERE created < ?", (now - self.ttl,))
+        evicted = cursor.rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM parse_results").fetchone()[0]
+        if count > self.max_entries:
+            cursor = self._conn.execute(
+                "DELETE FROM parse_results WHERE rowid IN "
+                "(SELECT rowid FROM parse_results ORDER BY accessed LIMIT ?)",
+                (count - self.max_entries,))
+            evicted += cursor.rowcount
+        if evicted:
+            self.evictions += evicted
+            logging.debug(f"Evicted {evicted} cached parse results")
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM parse_results").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bypassed': self.bypassed,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': entries,
+            }
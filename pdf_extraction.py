@@ -0,0 +1,143 @@
+import io
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from worker_pool import worker_context
+
+# Oversized uploads stop being read once either cap is reached
+MAX_PAGES = 40
+MAX_CHARS = 200_000
+
+# Documents with at least this many pages are split across worker processes
+PARALLEL_PAGE_THRESHOLD = 8
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+PdfPage = namedtuple('PdfPage', ['number', 'text', 'links'])
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=worker_context())
+        return _executor
+
+
+def _discard_executor(broken):
+    # A worker that dies breaks the whole pool; the next call starts a new one
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _open_source(source):
+    """Accepts a path, raw PDF bytes or a binary file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if isinstance(source, (str, Path)):
+        return open(source, 'rb')
+    return source
+
+
+def _page_links(page):
+    links = []
+    if "/Annots" in page:
+        for annot in page["/Annots"]:
+            annot = annot.get_object()
+            if annot.get("/Subtype") == "/Link" and annot.get("/A"):
+                link = annot["/A"].get("/URI")
+                if link:
+                    links.append(str(link))
+    return links
+
+
+def _pdf_reader(stream):
+    # pypdf is imported on first use; it is a noticeable share of app start-up
+    from pypdf import PdfReader
+    return PdfReader(stream)
+
+
+def _extract_page(reader, index):
+    page = reader.pages[index]
+    return PdfPage(index + 1, page.extract_text() or "", _page_links(page))
+
+
+def _extract_range(pdf_bytes, start, stop):
+    # Runs in a worker process: parse the document once per chunk of pages
+    reader = _pdf_reader(io.BytesIO(pdf_bytes))
+    return [_extract_page(reader, index) for index in range(start, stop)]
+
+
+def _parallel_pages(pdf_bytes, page_count, workers):
+    chunk = -(-page_count // workers)
+
+    def submit(executor):
+        return [executor.submit(_extract_range, pdf_bytes, start, min(start + chunk, page_count))
+                for start in range(0, page_count, chunk)]
+
+    executor = _get_executor()
+    try:
+        futures = submit(executor)
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        futures = submit(_get_executor())
+    try:
+        # Chunks are consumed in page order so output stays deterministic
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def iter_pdf_pages(source, max_pages=MAX_PAGES, max_chars=MAX_CHARS,
+                   parallel_threshold=PARALLEL_PAGE_THRESHOLD, workers=MAX_WORKERS):
+    """
+    Yield PdfPage(number, text, links) for each page of a PDF, in order.
+
+    ``source`` may be a path, bytes or a binary file object. Reading stops
+    after ``max_pages`` pages or once ``max_chars`` characters have been
+    produced (the last page is truncated). Long documents are extracted by a
+    process pool in page chunks.
+    """
+    stream = _open_source(source)
+    try:
+        reader = _pdf_reader(stream)
+        page_count = len(reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+
+        if workers > 1 and page_count >= parallel_threshold:
+            if isinstance(source, (bytes, bytearray)):
+                pdf_bytes = bytes(source)
+            else:
+                stream.seek(0)
+                pdf_bytes = stream.read()
+            pages = _parallel_pages(pdf_bytes, page_count, workers)
+        else:
+            pages = (_extract_page(reader, index) for index in range(page_count))
+
+        remaining = max_chars
+        try:
+            for page in pages:
+                if remaining is not None:
+                    if len(page.text) >= remaining:
+                        yield page._replace(text=page.text[:remaining])
+                        return
+                    remaining -= len(page.text)
+                yield page
+        finally:
+            # Cancels outstanding worker chunks when we stop early
+            pages.close()
+    finally:
+        if stream is not source:
+            stream.close()
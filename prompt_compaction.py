@@ -0,0 +1,59 @@
+import re
+from collections import Counter
+
+# Page separator used by extract_text_and_links_from_pdf
+PAGE_BREAK = '\f'
+
+# Lines this close to the top or bottom of a page are boilerplate candidates
+EDGE_LINES = 3
+
+# The hyphen is kept: without a dictionary "self-\nmotivated" (a compound)
+# can't be told from "develop-\nment" (a hyphenated break)
+HYPHEN_BREAK = re.compile(r'(\w-)\n(?=[a-z])')
+INLINE_SPACE = re.compile(r'[ \t ]+')
+PAGE_NUMBER = re.compile(r'^(?:page\s*\d+|\d{1,3})(?:\s*(?:/|of)\s*\d+)?$', re.IGNORECASE)
+
+
+def _edge_lines(lines):
+    # On a page no longer than both edge windows every line would be an edge
+    if len(lines) <= 2 * EDGE_LINES:
+        return set()
+    return set(lines[:EDGE_LINES] + lines[-EDGE_LINES:])
+
+
+def compact_resume_text(text):
+    """
+    Normalize PDF text before it is sent to the model.
+
+    Joins words hyphenated across line breaks (keeping the hyphen), collapses
+    runs of whitespace, drops blank and consecutive duplicate lines and page
+    numbers, and keeps only the first copy of header or footer lines repeated
+    across pages.
+    """
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        page = HYPHEN_BREAK.sub(r'\1', page)
+        lines = [INLINE_SPACE.sub(' ', line).strip() for line in page.splitlines()]
+        pages.append([line for line in lines if line])
+
+    repeated = set()
+    if len(pages) > 1:
+        counts = Counter(line for lines in pages for line in _edge_lines(lines))
+        repeated = {line for line, count in counts.items() if count >= 2}
+
+    output = []
+    kept = set()
+    for lines in pages:
+        edges = _edge_lines(lines)
+        for line in lines:
+            if line in repeated and line in edges:
+                # Keep the first copy: running headers often carry the name
+                if line in kept:
+                    continue
+                kept.add(line)
+            if line in edges and PAGE_NUMBER.match(line):
+                continue
+            if output and output[-1] == line:
+                continue
+            output.append(line)
+    return '\n'.join(output)
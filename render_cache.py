@@ -0,0 +1,121 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Default bounds for the PDF render cache
+MAX_ENTRIES = 500
+MAX_BYTES = 512 * 1024 * 1024
+
+CACHED_PDF_PATTERN = re.compile(r'^resume_([0-9a-f]{64})\.pdf$')
+
+
+def render_key(tex_content, template_version):
+    """
+    Content address for a rendered resume: the TeX source plus the version of
+    the template (and compile pipeline) that produced it.
+    """
+    digest = hashlib.sha256()
+    digest.update(template_version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(tex_content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Content-addressed LRU cache of compiled resume PDFs.
+
+    Cached files live in ``directory`` as ``resume_<key>.pdf`` so that a hit is
+    just a path lookup. The cache is bounded both by entry count and by total
+    size on disk; the least recently used PDFs are deleted first.
+    """
+
+    def __init__(self, directory, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(exist_ok=True, parents=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_existing()
+
+    def _path_for(self, key):
+        return self.directory / f"resume_{key}.pdf"
+
+    def _load_existing(self):
+        # Re-index PDFs left by a previous process, least recently used first
+        found = []
+        for entry in os.scandir(self.directory):
+            match = CACHED_PDF_PATTERN.match(entry.name)
+            if match and entry.is_file():
+                stat = entry.stat()
+                found.append((stat.st_mtime, match.group(1), stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def get(self, key):
+        """Return the cached PDF path for ``key`` or None on a miss."""
+        with self._lock:
+            if key in self._entries:
+                path = self._path_for(key)
+                if path.is_file():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return str(path)
+                # File was removed behind our back
+                self._total_bytes -= self._entries.pop(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, pdf_path):
+        """
+        Move a freshly compiled PDF into the cache and return its cached path.
+        """
+        target = self._path_for(key)
+        os.replace(pdf_path, target)
+        size = target.stat().st_size
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict(keep=key)
+        return str(target)
+
+    def _evict(self, keep=None):
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._total_bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            size = self._entries.pop(key)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                self._path_for(key).unlink()
+            except FileNotFoundError:
+                pass
+            logging.debug(f"Evicted cached PDF {key}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+            }
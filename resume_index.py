@@ -0,0 +1,361 @@
+"""
+Persistent search index over parsed resumes.
+
+Every parse result (the extractor's JSON) is tokenized per field and stored
+in SQLite; in memory, each term keeps compact posting arrays of document
+ids, field-weighted term frequencies and a bitmask of the fields it came
+from, i.e. the columns of a sparse document-term matrix. A job description
+is ranked against them with BM25F term-at-a-time, so a query only touches
+the postings of its own terms, and every hit lists the terms it matched.
+
+    python resume_index.py import-cache --owner alice
+    python resume_index.py add results.jsonl --owner alice
+    python resume_index.py search job.txt -k 10
+"""
+import re
+import sys
+import json
+import math
+import time
+import heapq
+import bisect
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from array import array
+from pathlib import Path
+
+from instrumentation import span
+
+INDEX_DB = Path(__file__).parent / 'resume_index.db'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# BM25F: a term's frequency counts this many times per occurrence in the field
+FIELD_WEIGHTS = {
+    'skills': 3.0,
+    'title': 2.0,
+    'company': 1.5,
+    'project': 1.5,
+    'education': 1.0,
+    'text': 1.0,
+}
+FIELDS = tuple(FIELD_WEIGHTS)
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+MAX_QUERY_CHARS = 20000
+MAX_EXPLAINED_TERMS = 10
+
+# Keeps c++, c#, node.js and ci/cd-style parts together
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could
+do does during each etc for from had has have having he her his how i if in into is it
+its may more most must no not of on or our out over own per she should so some such than
+that the their them then there these they this those through to under up us very was we
+were what when where which while who will with within would you your
+""".split())
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall((text or '').lower())
+            if token not in STOPWORDS]
+
+
+def _strings(value):
+    """Flatten strings out of nested lists (model output is not always the schema)."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def field_texts(data):
+    """(field, text) pairs of a parse result, by index field."""
+    for skill in _strings([data.get('technical_skills'), data.get('soft_skills')]):
+        yield 'skills', skill
+    yield 'text', data.get('professional_summary') or ''
+    yield 'text', ' '.join(_strings(data.get('certifications')))
+    for job in data.get('employment_details') or ():
+        if not isinstance(job, dict):
+            continue
+        yield 'title', job.get('title') or ''
+        yield 'company', job.get('company') or ''
+        yield 'text', ' '.join(_strings([job.get('responsibilities'), job.get('achievements')]))
+    for project in data.get('projects') or ():
+        if not isinstance(project, dict):
+            continue
+        yield 'project', ' '.join(_strings([project.get('name'), project.get('technologies')]))
+        yield 'text', project.get('description') or ''
+    for edu in data.get('education') or ():
+        if isinstance(edu, dict):
+            yield 'education', ' '.join(_strings([edu.get('degree'), edu.get('institution')]))
+
+
+def document_terms(data):
+    """{term: [weighted tf, field mask]} for a parse result."""
+    terms = {}
+    for field, text in field_texts(data):
+        weight, bit = FIELD_WEIGHTS[field], 1 << FIELDS.index(field)
+        for token in tokenize(text):
+            entry = terms.setdefault(token, [0.0, 0])
+            entry[0] += weight
+            entry[1] |= bit
+    return terms
+
+
+def _headline(data):
+    info = data.get('personal_info') if isinstance(data.get('personal_info'), dict) else {}
+    jobs = [job for job in data.get('employment_details') or () if isinstance(job, dict)]
+    headline = ''
+    if jobs:
+        headline = ' at '.join(part for part in (jobs[0].get('title'), jobs[0].get('company')) if part)
+    return info.get('full_name') or '', headline
+
+
+class ResumeIndex:
+    """
+    Index of parse results keyed by (owner, PDF SHA-256). ``add`` is
+    incremental and idempotent; ``search`` ranks an owner's resumes (or all
+    of them) against a job description. Postings are loaded from SQLite on
+    first use and re-synced when another process has added documents.
+    """
+
+    def __init__(self, path=INDEX_DB):
+        self.path = str(path)
+        self._lock = threading.RLock()
+        self._connection = None
+        self._loaded = False
+        self._reset()
+
+    @property
+    def _conn(self):
+        # Opened on first use (callers hold self._lock), so importing the app,
+        # or a worker process importing it, doesn't touch the database
+        if self._connection is None:
+            self._connection = self._open()
+        return self._connection
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''CREATE TABLE IF NOT EXISTS documents
+                        (doc_id INTEGER PRIMARY KEY AUTOINCREMENT, owner TEXT, pdf_sha256 TEXT,
+                         name TEXT, headline TEXT, ats_score INTEGER, data_sha256 TEXT,
+                         terms TEXT, length REAL, added REAL,
+                         UNIQUE (owner, pdf_sha256))''')
+        conn.commit()
+        return conn
+
+    def _reset(self):
+        self._postings = {}   # term -> (doc ids, weighted tfs, field masks)
+        self._docs = {}       # doc_id -> (owner, pdf_sha256, name, headline, ats_score, length)
+        self._keys = {}       # (owner, pdf_sha256) -> (doc_id, data_sha256)
+        self._total_length = 0.0
+        self._last_doc_id = 0
+
+    def _append(self, doc_id, owner, pdf_sha256, name, headline, ats_score, data_sha256, terms, length):
+        for term, (tf, mask) in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('I'), array('f'), array('B'))
+            postings[0].append(doc_id)
+            postings[1].append(tf)
+            postings[2].append(mask)
+        self._docs[doc_id] = (owner, pdf_sha256, name, headline, ats_score, length)
+        self._keys[(owner, pdf_sha256)] = (doc_id, data_sha256)
+        self._total_length += length
+        self._last_doc_id = max(self._last_doc_id, doc_id)
+
+    def _remove(self, doc_id, terms):
+        for term in terms:
+            ids, tfs, masks = self._postings[term]
+            position = bisect.bisect_left(ids, doc_id)
+            if position < len(ids) and ids[position] == doc_id:
+                del ids[position], tfs[position], masks[position]
+            if not ids:
+                del self._postings[term]
+        owner, pdf_sha256, *_, length = self._docs.pop(doc_id)
+        self._keys.pop((owner, pdf_sha256), None)
+        self._total_length -= length
+
+    def _load_rows(self, min_doc_id=0):
+        rows = self._conn.execute(
+            "SELECT doc_id, owner, pdf_sha256, name, headline, ats_score, data_sha256, terms, length "
+            "FROM documents WHERE doc_id > ? ORDER BY doc_id", (min_doc_id,))
+        for doc_id, owner, pdf_sha256, name, headline, ats_score, data_sha256, terms, length in rows:
+            stale = self._keys.get((owner, pdf_sha256))
+            if stale:
+                # Replaced by another process since we loaded it
+                self._remove(stale[0], self._doc_terms(stale[0]))
+            self._append(doc_id, owner, pdf_sha256, name, headline, ats_score, data_sha256,
+                         json.loads(terms), length)
+
+    def _doc_terms(self, doc_id):
+        return [term for term, (ids, _, _) in self._postings.items()
+                if (position := bisect.bisect_left(ids, doc_id)) < len(ids) and ids[position] == doc_id]
+
+    def _sync(self):
+        """Load the index on first use, then pick up documents other processes added."""
+        count, last = self._conn.execute("SELECT COUNT(*), MAX(doc_id) FROM documents").fetchone()
+        if not self._loaded:
+            started = time.perf_counter()
+            self._load_rows()
+            self._loaded = True
+            logging.debug(f"Loaded {len(self._docs)} indexed resumes in "
+                          f"{time.perf_counter() - started:.2f}s")
+        elif (last or 0) > self._last_doc_id:
+            self._load_rows(self._last_doc_id)
+        if count != len(self._docs):
+            # Rows were deleted elsewhere; a full reload is simplest
+            self._reset()
+            self._load_rows()
+
+    def add(self, pdf_sha256, data, ats_score=None, owner=''):
+        """Index (or re-index) one parse result; returns False if it was already current."""
+        data_sha256 = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+        with self._lock, span('index_add'):
+            self._sync()
+            current = self._keys.get((owner, pdf_sha256))
+            if current and current[1] == data_sha256:
+                return False
+            terms = document_terms(data)
+            length = sum(tf for tf, _ in terms.values())
+            name, headline = _headline(data)
+            if current:
+                self._remove(current[0], self._doc_terms(current[0]))
+                self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (current[0],))
+            cursor = self._conn.execute(
+                "INSERT INTO documents (owner, pdf_sha256, name, headline, ats_score, data_sha256, "
+                "terms, length, added) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (owner, pdf_sha256, name, headline, ats_score, data_sha256,
+                 json.dumps(terms, separators=(',', ':')), length, time.time()))
+            self._conn.commit()
+            self._append(cursor.lastrowid, owner, pdf_sha256, name, headline, ats_score,
+                         data_sha256, terms, length)
+        return True
+
+    def __len__(self):
+        with self._lock:
+            self._sync()
+            return len(self._docs)
+
+    def count(self, owner=None):
+        with self._lock:
+            self._sync()
+            if owner is None:
+                return len(self._docs)
+            return sum(1 for doc in self._docs.values() if doc[0] == owner)
+
+    def search(self, job_description, limit=DEFAULT_LIMIT, owner=None):
+        """
+        Rank indexed resumes (only ``owner``'s unless None) against a job
+        description. Each result has the BM25F relevance, the resume's name,
+        headline and ATS score, and its matched terms with their share of
+        the relevance and the fields they were found in.
+        """
+        query = {}
+        for token in tokenize(job_description[:MAX_QUERY_CHARS]):
+            query[token] = query.get(token, 0) + 1
+        with self._lock, span('index_search'):
+            self._sync()
+            total = len(self._docs)
+            if not total or not query:
+                return []
+            avg_length = self._total_length / total or 1.0
+            norms = {doc_id: K1 * (1 - B + B * doc[5] / avg_length)
+                     for doc_id, doc in self._docs.items()}
+            weights = {}
+            for term, count in query.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                df = len(postings[0])
+                idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                # Repeated terms in the job description count, with diminishing returns
+                weights[term] = (idf * (1 + math.log(count)), postings)
+
+            scores = {}
+            for weight, (ids, tfs, _) in weights.values():
+                for doc_id, tf in zip(ids, tfs):
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf * (K1 + 1) / (tf + norms[doc_id])
+            if owner is not None:
+                scores = {doc_id: score for doc_id, score in scores.items()
+                          if self._docs[doc_id][0] == owner}
+            top = heapq.nlargest(min(limit, MAX_LIMIT), scores.items(), key=lambda item: item[1])
+            return [self._explain(doc_id, score, weights, norms[doc_id]) for doc_id, score in top]
+
+    def _explain(self, doc_id, score, weights, norm):
+        owner, pdf_sha256, name, headline, ats_score, _ = self._docs[doc_id]
+        matched = []
+        for term, (weight, (ids, tfs, masks)) in weights.items():
+            position = bisect.bisect_left(ids, doc_id)
+            if position < len(ids) and ids[position] == doc_id:
+                tf = tfs[position]
+                matched.append({
+                    'term': term,
+                    'contribution': round(weight * tf * (K1 + 1) / (tf + norm) / score, 3),
+                    'fields': [field for bit, field in enumerate(FIELDS) if masks[position] >> bit & 1],
+                })
+        matched.sort(key=lambda match: match['contribution'], reverse=True)
+        return {
+            'sha256': pdf_sha256, 'owner': owner, 'name': name, 'headline': headline,
+            'ats_score': ats_score, 'relevance': round(score, 4),
+            'matched_terms': matched[:MAX_EXPLAINED_TERMS], 'matched_count': len(matched),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index parsed resumes and rank them against a job description.")
+    parser.add_argument('--db', default=str(INDEX_DB), help="index database")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="index the ok records of batch_parse.py JSONL output")
+    add.add_argument('jsonl')
+    add.add_argument('--owner', default='')
+    imported = commands.add_parser('import-cache', help="index every result in the parse cache")
+    imported.add_argument('--owner', default='')
+    search = commands.add_parser('search', help="rank resumes against a job description file ('-' for stdin)")
+    search.add_argument('job_description')
+    search.add_argument('-k', '--limit', type=int, default=DEFAULT_LIMIT)
+    search.add_argument('--owner', default=None, help="only this owner's resumes")
+    search.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    index = ResumeIndex(args.db)
+    if args.command == 'add':
+        added = 0
+        with open(args.jsonl) as lines:
+            for line in lines:
+                record = json.loads(line)
+                if record.get('status') == 'ok' and record.get('data'):
+                    added += index.add(record['sha256'], record['data'], record.get('score'), args.owner)
+        print(f"Indexed {added} new resumes; {index.count()} in the index", file=sys.stderr)
+    elif args.command == 'import-cache':
+        from parse_cache import ParseCache
+        added = sum(index.add(digest, data, score, args.owner)
+                    for digest, data, score in ParseCache().iter_results())
+        print(f"Indexed {added} new resumes; {index.count()} in the index", file=sys.stderr)
+    else:
+        text = sys.stdin.read() if args.job_description == '-' else Path(args.job_description).read_text()
+        started = time.perf_counter()
+        results = index.search(text, args.limit, args.owner)
+        elapsed = time.perf_counter() - started
+        if args.json:
+            print(json.dumps(results, indent=2))
+        for rank, result in enumerate([] if args.json else results, start=1):
+            terms = ', '.join(f"{match['term']} ({'/'.join(match['fields'])})"
+                              for match in result['matched_terms'])
+            print(f"{rank:3d}. {result['relevance']:7.3f}  {result['name'] or result['sha256'][:12]}"
+                  f"  {result['headline']}\n       {terms}")
+        print(f"{len(results)} of {index.count(args.owner)} resumes in {elapsed * 1000:.1f}ms",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
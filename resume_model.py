@@ -0,0 +1,178 @@
+from dataclasses import dataclass, fields, is_dataclass, replace
+
+
+class ResumeValidationError(ValueError):
+    """Raised when builder form data cannot be turned into a Resume."""
+
+
+@dataclass(frozen=True)
+class PersonalInfo:
+    name: str = ''
+    email: str = ''
+    phone: str = ''
+    github: str = ''
+    linkedin: str = ''
+
+
+@dataclass(frozen=True)
+class Experience:
+    title: str = ''
+    company: str = ''
+    duration: str = ''
+    description: str = ''
+    responsibilities: tuple = ()
+
+
+@dataclass(frozen=True)
+class Project:
+    name: str = ''
+    description: str = ''
+    link: str = ''
+
+
+@dataclass(frozen=True)
+class Education:
+    degree: str = ''
+    institution: str = ''
+    year: str = ''
+    gpa: str = ''
+
+
+@dataclass(frozen=True)
+class SkillGroup:
+    title: str
+    skills: tuple = ()
+
+
+@dataclass(frozen=True)
+class Resume:
+    """
+    Normalized builder resume. Every renderer (LaTeX, HTML, plain text)
+    works from this model, so the form JSON is validated in one place.
+    """
+    personal_info: PersonalInfo = PersonalInfo()
+    summary: str = ''
+    experience: tuple = ()
+    projects: tuple = ()
+    education: tuple = ()
+    skills: tuple = ()
+
+    @classmethod
+    def from_form(cls, data):
+        """Build a Resume from the JSON the builder form posts."""
+        if not isinstance(data, dict):
+            raise ResumeValidationError("Resume data must be an object")
+        info = _mapping(data.get('personal_info'), 'personal_info')
+        skills = _mapping(data.get('skills'), 'skills')
+        return cls(
+            personal_info=PersonalInfo(
+                name=_text(info.get('name')),
+                email=_text(info.get('email')),
+                phone=_text(info.get('phone')),
+                github=_text(info.get('github')),
+                linkedin=_text(info.get('linkedin')),
+            ),
+            summary=_text(data.get('summary')),
+            experience=_entries(data.get('experience'), 'experience', Experience,
+                                responsibilities=_text_list),
+            projects=_entries(data.get('projects'), 'projects', Project),
+            education=_entries(data.get('education'), 'education', Education),
+            skills=tuple(
+                group for group in (SkillGroup(_text(title), _text_list(items))
+                                    for title, items in skills.items())
+                if group.skills
+            ),
+        )
+
+    def escaped(self, escape):
+        """Copy of the resume with ``escape`` applied to every string, in one walk."""
+        return _map_text(self, escape)
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list, tuple)):
+        raise ResumeValidationError(f"Expected text, got {type(value).__name__}")
+    return str(value).strip()
+
+
+def _text_list(value):
+    """A list of strings (or one newline separated string), blanks dropped."""
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = value.splitlines()
+    if not isinstance(value, (list, tuple)):
+        raise ResumeValidationError(f"Expected a list, got {type(value).__name__}")
+    return tuple(text for text in map(_text, value) if text)
+
+
+def _mapping(value, name):
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ResumeValidationError(f"'{name}' must be an object")
+    return value
+
+
+def _entries(value, name, entry_type, **converters):
+    """Convert a list of form dicts into ``entry_type`` tuples, skipping blank entries."""
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        raise ResumeValidationError(f"'{name}' must be a list")
+    entries = []
+    for item in value:
+        item = _mapping(item, name)
+        entry = entry_type(**{
+            f.name: converters.get(f.name, _text)(item.get(f.name)) for f in fields(entry_type)
+        })
+        if any(getattr(entry, f.name) for f in fields(entry_type)):
+            entries.append(entry)
+    return tuple(entries)
+
+
+def _map_text(value, fn):
+    if isinstance(value, str):
+        return fn(value)
+    if isinstance(value, tuple):
+        return tuple(_map_text(item, fn) for item in value)
+    if is_dataclass(value):
+        return replace(value, **{f.name: _map_text(getattr(value, f.name), fn) for f in fields(value)})
+    return value
+
+
+def render_text(resume):
+    """Plain-text rendering of a Resume, for the text preview."""
+    info = resume.personal_info
+    lines = [info.name] if info.name else []
+    contact = ' | '.join(value for value in (info.email, info.phone, info.github, info.linkedin) if value)
+    if contact:
+        lines.append(contact)
+    if resume.summary:
+        lines += ['', 'Summary', resume.summary]
+    if resume.experience:
+        lines += ['', 'Experience']
+        for exp in resume.experience:
+            heading = ' at '.join(part for part in (exp.title, exp.company) if part)
+            lines.append(f"{heading} ({exp.duration})" if exp.duration else heading)
+            if exp.description:
+                lines.append(exp.description)
+            lines += [f"- {item}" for item in exp.responsibilities]
+    if resume.projects:
+        lines += ['', 'Projects']
+        for project in resume.projects:
+            line = f"{project.name}: {project.description}" if project.description else project.name
+            lines.append(f"{line} ({project.link})" if project.link else line)
+    if resume.education:
+        lines += ['', 'Education']
+        for edu in resume.education:
+            line = ', '.join(part for part in (edu.degree, edu.institution) if part)
+            if edu.year:
+                line += f" - {edu.year}"
+            lines.append(f"{line} (GPA: {edu.gpa})" if edu.gpa else line)
+    if resume.skills:
+        lines += ['', 'Skills']
+        lines += [f"{group.title}: {', '.join(group.skills)}" for group in resume.skills]
+    return '\n'.join(lines)
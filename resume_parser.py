@@ -1,8 +1,16 @@
 import os
 import json
+import asyncio
+import hashlib
+import logging
+import threading
 import yaml
-from pypdf import PdfReader
-import google.generativeai as genai
+from pdf_extraction import iter_pdf_pages, MAX_PAGES, MAX_CHARS
+from ats_scoring import score_resume, scoring_version
+from extractors import make_extractor, parse_model_json, schema_prompt
+from prompt_compaction import compact_resume_text, PAGE_BREAK
+from llm_client import LLMClient, AdaptiveLimiter, DEFAULT_DEADLINE, MAX_RETRIES, MAX_CONCURRENCY
+from instrumentation import span, incr
 
 # Load API Key from Config File
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.yaml")
@@ -11,119 +19,171 @@ with open(CONFIG_PATH) as file:
 
 API_KEY = config['GENAI_API_KEY']
 
-# Configure API Key before using GenerativeModel
-genai.configure(api_key=API_KEY)
+# Optional {name: [terms]} override for the local scorer's skill keywords
+SKILL_VOCABULARIES = config.get('ATS_SKILL_VOCABULARIES')
+# Changes with the vocabularies, so overriding them invalidates cached scores
+LOCAL_SCORING_VERSION = scoring_version(SKILL_VOCABULARIES)
 
-# Initialize Google Gemini Model
-model = genai.GenerativeModel("gemini-1.5-flash")
+MODEL_NAME = "gemini-1.5-flash"
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """
+    The Gemini GenerativeModel, created on first use. google.generativeai
+    takes most of a second to import, so processes that never call Gemini
+    (or call it late) do not pay for it at start-up.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=API_KEY)
+                _model = genai.GenerativeModel(MODEL_NAME)
+    return _model
+
+class LazyModel:
+    """Stands in for the GenerativeModel and creates it on first attribute access."""
+
+    def __getattr__(self, name):
+        return getattr(get_model(), name)
+
+model = LazyModel()
+
+# Every Gemini call goes through this client (limits, deadlines, retries)
+llm = LLMClient(model, deadline=config.get('LLM_DEADLINE_SECONDS', DEFAULT_DEADLINE),
+                max_retries=config.get('LLM_MAX_RETRIES', MAX_RETRIES),
+                limiter=AdaptiveLimiter(maximum=config.get('LLM_MAX_CONCURRENCY', MAX_CONCURRENCY)))
+
+# 'hybrid' (heuristics first, Gemini for the rest; see HybridExtractor), 'gemini' or
+# 'heuristic' (offline)
+EXTRACTOR_BACKEND = config.get('EXTRACTOR_BACKEND', 'hybrid')
+extractor = make_extractor(EXTRACTOR_BACKEND, llm)
+
+def warm_up():
+    """
+    Load everything the parser defers (Gemini client, pypdf). Call it from a
+    pre-fork server hook so workers start with it already imported.
+    """
+    get_model()
+    import pypdf  # noqa: F401
 
 # Function to Read PDF Text and Extract Links
-def extract_text_and_links_from_pdf(path):
-    reader = PdfReader(path)
-    text = ""
-    links = set()  # Use a set to avoid duplicate links
-    
-    for page in reader.pages:
-        if page.extract_text():
-            text += page.extract_text()
-        
-        if "/Annots" in page:
-            for annot in page["/Annots"]:
-                if annot.get("/Subtype") == "/Link" and annot.get("/A"):
-                    link = annot["/A"].get("/URI")
-                    if link:
-                        links.add(link)  # Add link to set to remove duplicates
-    
-    return text, list(links)  # Convert set back to list
+def extract_text_and_links_from_pdf(source, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    """
+    Return (text, links) for a PDF given as a path, bytes or file object.
+    Pages are streamed from iter_pdf_pages, so the size caps stop early, and
+    joined with a form feed so page boundaries survive for compaction.
+    """
+    texts = []
+    links = {}  # dict keeps first-seen order while removing duplicates
+    with span('pdf_extract'):
+        for page in iter_pdf_pages(source, max_pages=max_pages, max_chars=max_chars):
+            texts.append(page.text)
+            links.update(dict.fromkeys(page.links))
+    return PAGE_BREAK.join(texts), list(links)
+
+EXTRACTION_PROMPT = schema_prompt()
+
+SCORE_PROMPT = (
+    "You are an expert ATS (Applicant Tracking System) evaluator. Given the resume text and "
+    "extracted data, provide a score out of 100 based on ATS compatibility. Consider: presence "
+    "of key sections (personal info, employment, education, skills, etc.); clarity and "
+    "structure; keywords and quantifiable achievements; links and portfolio inclusion. "
+    'Return only a JSON object like: {"score": number}'
+)
+
+# Identifies the prompts and model behind a cached parse result
+PROMPT_VERSION = hashlib.sha256(
+    f"{MODEL_NAME}\n{EXTRACTOR_BACKEND}\n{EXTRACTION_PROMPT}\n{SCORE_PROMPT}".encode('utf-8')
+).hexdigest()[:16]
+
+def score_version(use_llm=False):
+    """Cache version for a parse result scored with the given scorer."""
+    return f"{PROMPT_VERSION}:{'llm' if use_llm else LOCAL_SCORING_VERSION}"
 
 # Function to extract ATS details from resume
-def ats_extractor(resume_data, links):
-    prompt = '''
-    You are an expert ATS (Applicant Tracking System) parser. Extract and return ONLY the following information in the exact structure specified:
-    {
-        "personal_info": {
-            "full_name": string,
-            "email_id": string,
-            "phone": string or null,
-            "location": string or null,
-            "github_portfolio": string or null,
-            "linkedin_id": string or null
-        },
-        "professional_summary": string or null,
-        "employment_details": [
-            {
-                "company": string,
-                "title": string,
-            "duration": string,
-                "responsibilities": [string],
-                "achievements": [string]
-            }
-        ],
-        "education": [
-            {
-                "degree": string,
-                "institution": string,
-                "year": string,
-                "gpa": string or null
-            }
-        ],
-        "projects": [
-            {
-                "name": string,
-                "description": string,
-                "technologies": [string],
-                "link": string or null
-            }
-        ],
-        "technical_skills": [string],
-        "soft_skills": [string],
-        "certifications": [
-            {
-                "name": string,
-                "organization": string,
-                "date": string or null
-            }
-        ],
-        "extracted_links": [string]  # Extracted links from the resume
-    }
-    Ensure all arrays are empty lists [] if no data is found, not null.
-    '''
+def ats_extractor(resume_data, links, backend=None):
+    """Extract the resume schema with ``backend`` (default: the configured extractor)."""
+    return (backend or extractor).extract(compact_resume_text(resume_data), links)
+
+async def extract_text_and_links_from_pdf_async(source, max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    """extract_text_and_links_from_pdf on a worker thread, so the event loop keeps serving."""
+    return await asyncio.to_thread(extract_text_and_links_from_pdf, source, max_pages, max_chars)
 
+async def ats_extractor_async(resume_data, links, backend=None):
+    """Async ats_extractor; the Gemini calls are awaited instead of blocking a thread."""
+    return await (backend or extractor).extract_async(compact_resume_text(resume_data), links)
+
+# Local, deterministic ATS score with a per-factor breakdown
+def ats_score_breakdown(resume_data, extracted_data):
+    with span('ats_score'):
+        return score_resume(extracted_data, resume_data, SKILL_VOCABULARIES)
+
+class ScoreUnavailable(Exception):
+    """The Gemini scorer failed or returned no usable score."""
+
+# Function to calculate ATS score
+def calculate_ats_score(resume_data, extracted_data, use_llm=False):
+    """
+    Score a parsed resume out of 100. The local rule-based scorer is used
+    unless the caller explicitly opts in to the Gemini scorer with use_llm,
+    which raises ScoreUnavailable when Gemini gives no score.
+    """
+    if not use_llm:
+        return ats_score_breakdown(resume_data, extracted_data)['score']
     try:
-        response = model.generate_content(f"{prompt}\nResume:\n{resume_data}\nLinks: {links}")
-        clean_response = response.text.strip()
-        
-        if clean_response.startswith('```json'):
-            clean_response = clean_response[7:]
-        if clean_response.endswith('```'):
-            clean_response = clean_response[:-3]
-        
-        extracted_data = json.loads(clean_response.strip())
-        
-        return extracted_data
-    except json.JSONDecodeError as e:
-        return {"error": "Failed to parse resume data", "details": str(e)}
+        response = llm.generate(_score_prompt(resume_data, extracted_data), 'score')
     except Exception as e:
-        return {"error": "Failed to process resume", "details": str(e)}
+        raise ScoreUnavailable(str(e)) from e
+    return _parse_score(response)
 
-# Function to calculate ATS score
-def calculate_ats_score(resume_data, extracted_data):
-    score_prompt = '''
-    You are an expert ATS (Applicant Tracking System) evaluator. Given the resume text and extracted data, provide a score out of 100 based on ATS compatibility. Consider factors like:
-    - Presence of key sections (personal info, employment, education, skills, etc.)
-    - Clarity and structure of content
-    - Use of keywords and quantifiable achievements
-    - Links and portfolio inclusion
-    Return only a JSON object like: {"score": number}
-    '''
+async def calculate_ats_score_async(resume_data, extracted_data, use_llm=False):
+    """Async calculate_ats_score; the local scorer is cheap enough to run inline."""
+    if not use_llm:
+        return ats_score_breakdown(resume_data, extracted_data)['score']
+    try:
+        response = await llm.generate_async(_score_prompt(resume_data, extracted_data), 'score')
+    except Exception as e:
+        raise ScoreUnavailable(str(e)) from e
+    return _parse_score(response)
+
+def score_parsed_resume(resume_data, extracted_data, use_llm=False):
+    """
+    (score, breakdown, fallback) for a parsed resume. When the Gemini scorer
+    fails, the local score and breakdown are returned with fallback=True;
+    callers show that and must not cache the result as a Gemini score.
+    """
+    if use_llm:
+        try:
+            return calculate_ats_score(resume_data, extracted_data, use_llm=True), None, False
+        except ScoreUnavailable as e:
+            logging.warning(f"Gemini scoring failed, using the local score: {e}")
+    report = ats_score_breakdown(resume_data, extracted_data)
+    return report['score'], report['breakdown'], use_llm
+
+async def score_parsed_resume_async(resume_data, extracted_data, use_llm=False):
+    """Async score_parsed_resume."""
+    if use_llm:
+        try:
+            score = await calculate_ats_score_async(resume_data, extracted_data, use_llm=True)
+            return score, None, False
+        except ScoreUnavailable as e:
+            logging.warning(f"Gemini scoring failed, using the local score: {e}")
+    report = ats_score_breakdown(resume_data, extracted_data)
+    return report['score'], report['breakdown'], use_llm
+
+def _score_prompt(resume_data, extracted_data):
+    return (f"{SCORE_PROMPT}\nResume Text:\n{compact_resume_text(resume_data)}\n"
+            f"Extracted Data:\n{json.dumps(extracted_data, separators=(',', ':'))}")
+
+def _parse_score(response):
     try:
-        response = model.generate_content(f"{score_prompt}\nResume Text:\n{resume_data}\nExtracted Data:\n{json.dumps(extracted_data)}")
-        clean_response = response.text.strip()
-        if clean_response.startswith('```json'):
-            clean_response = clean_response[7:]
-        if clean_response.endswith('```'):
-            clean_response = clean_response[:-3]
-        score_data = json.loads(clean_response.strip())
-        return score_data["score"]
+        score = parse_model_json(response.text)["score"]
+        if not isinstance(score, (int, float)):
+            raise TypeError(f"score is {type(score).__name__}")
+        return score
     except Exception as e:
-        return 50  # Fallback score if GenAI fails
\ No newline at end of file
+        incr('resume_llm_failures_total', call='score', reason='invalid_response')
+        raise ScoreUnavailable(f"Unusable score response: {e}") from e
\ No newline at end of file
@@ -16,6 +16,28 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
 
+  // Rendered preview sections keyed by id: { fingerprint, node }
+  let previewSections = {};
+
+  function applyPreviewSections(result) {
+    const nodes = result.order.map((id) => {
+      let section = previewSections[id];
+      if (id in result.sections) {
+        const node = document.createElement("div");
+        node.dataset.section = id;
+        node.innerHTML = result.sections[id];
+        section = { node };
+      }
+      section.fingerprint = result.fingerprints[id];
+      return [id, section];
+    });
+    previewSections = Object.fromEntries(nodes);
+    // Unchanged sections keep their existing DOM nodes
+    const wrapper = document.createElement("div");
+    previewContent.replaceChildren(wrapper);
+    nodes.forEach(([, section]) => wrapper.appendChild(section.node));
+  }
+
   // UPDATED updatePreview to construct and send JSON data
   async function updatePreview() {
     try {
@@ -93,13 +115,21 @@ document.addEventListener("DOMContentLoaded", () => {
 
       const payload = new FormData();
       payload.append("data", JSON.stringify(data));
+      const fingerprints = Object.fromEntries(
+        Object.entries(previewSections).map(([id, section]) => [id, section.fingerprint])
+      );
+      payload.append("fingerprints", JSON.stringify(fingerprints));
 
-      // Call the HTML preview endpoint
+      // Call the HTML preview endpoint; 304 means every section is current
       const res = await fetch("/preview_html", { method: "POST", body: payload });
+      if (res.status === 304) {
+        togglePreview(true);
+        return;
+      }
       const result = await res.json();
 
-      if (result.preview) {
-        previewContent.innerHTML = result.preview;
+      if (result.order) {
+        applyPreviewSections(result);
         togglePreview(true);
       } else if (result.error) {
         console.error("Preview error:", result.error);
@@ -122,6 +152,7 @@ document.addEventListener("DOMContentLoaded", () => {
   form.addEventListener("submit", async (e) => {
     e.preventDefault();
     const isPreview = e.submitter.name === "preview";
+    const isDraft = e.submitter.name === "draft";
     
     if (isPreview) {
       updatePreview();
@@ -204,14 +235,35 @@ document.addEventListener("DOMContentLoaded", () => {
         payload.append("data", JSON.stringify(data));
         payload.append("preview", "false");
 
+        if (isDraft) {
+          // Draft PDFs are rendered synchronously in the request; open inline
+          payload.append("draft", "true");
+          const draftRes = await fetch("/builder", { method: "POST", body: payload });
+          loadingModal.hide();
+          if (!draftRes.ok) {
+            throw new Error((await draftRes.json()).error || "Unknown error occurred");
+          }
+          const url = URL.createObjectURL(await draftRes.blob());
+          window.open(url, "_blank");
+          setTimeout(() => URL.revokeObjectURL(url), 60000);
+          return;
+        }
+
         const res = await fetch("/builder", { method: "POST", body: payload });
-        const result = await res.json();
+        let result = await res.json();
+
+        // The build runs in the background; long-poll until it finishes
+        while (res.ok && result.status_url && (result.status === "queued" || result.status === "running")) {
+          const statusRes = await fetch(`${result.status_url}?wait=20`);
+          result = await statusRes.json();
+          if (!statusRes.ok) break;
+        }
 
         loadingModal.hide();
 
-        if (result.download) {
+        if (result.result_url) {
           // Create download link
-          const downloadUrl = `/download/pdf`;
+          const downloadUrl = result.result_url;
           const a = document.createElement("a");
           a.href = downloadUrl;
           a.download = "resume.pdf";
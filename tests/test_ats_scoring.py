@@ -0,0 +1,72 @@
+from ats_scoring import score_resume, scoring_version, WEIGHTS
+
+RESUME = {
+    'personal_info': {'full_name': 'Jane Doe', 'email_id': 'jane@example.com', 'phone': '555 0100',
+                      'github_portfolio': 'https://github.com/jane', 'linkedin_id': None},
+    'professional_summary': 'Backend engineer.',
+    'employment_details': [{
+        'company': 'Acme', 'title': 'Engineer', 'duration': '2019 - 2023',
+        'responsibilities': ['Cut p95 latency by 40%', 'Built the billing service'],
+        'achievements': ['Saved $120k a year'],
+    }],
+    'education': [{'degree': 'BSc', 'institution': 'State University', 'year': '2018'}],
+    'projects': [{'name': 'Tracker', 'description': 'Served 150 users', 'link': 'https://x.dev'}],
+    'technical_skills': ['Python', 'Docker', 'PostgreSQL'],
+    'soft_skills': ['Mentoring'],
+}
+
+
+def keywords(data, text=''):
+    return score_resume(data, text)['breakdown']['keywords']['details']['matched']
+
+
+def test_breakdown_adds_up_to_the_score():
+    result = score_resume(RESUME, 'Jane Doe resume text')
+    assert 0 < result['score'] <= 100
+    assert result['version'] == scoring_version()
+    assert {name: factor['max'] for name, factor in result['breakdown'].items()} == WEIGHTS
+    assert abs(result['score'] - sum(f['score'] for f in result['breakdown'].values())) <= 0.5
+
+
+def test_error_results_score_zero_sections():
+    result = score_resume({'error': 'Failed to process resume'}, '')
+    assert result['breakdown']['sections']['score'] == 0
+
+
+def test_version_changes_with_the_vocabularies():
+    assert scoring_version() == scoring_version(None)
+    assert scoring_version({'langs': ['python']}) != scoring_version()
+    assert scoring_version({'langs': ['python']}) != scoring_version({'langs': ['python', 'go']})
+
+
+def test_malformed_model_fields_do_not_raise():
+    data = {
+        'personal_info': 'Jane Doe',
+        'technical_skills': 'Python, Docker',
+        'soft_skills': [['Leadership'], {'name': 'Mentoring'}, 3, None],
+        'employment_details': ['Acme', {'responsibilities': 'Grew revenue 30%', 'achievements': None}],
+        'projects': [None, {'description': ['Served 150 users']}],
+        'extracted_links': 'https://github.com/jane',
+    }
+    result = score_resume(data, '')
+    assert keywords(data) == ['docker', 'leadership', 'mentoring', 'python']
+    assert result['breakdown']['quantified_achievements']['details']['quantified'] == 2
+    assert result['breakdown']['links']['details']['github_or_portfolio']
+
+
+def test_years_are_not_quantified_impact():
+    bullets = ['Worked there 2019-2021', 'Joined in 1998', 'Cut costs by 12%', 'Managed 25 engineers']
+    data = {'employment_details': [{'responsibilities': bullets}]}
+    details = score_resume(data, '')['breakdown']['quantified_achievements']['details']
+    assert details['quantified'] == 2
+
+
+def test_ambiguous_terms_need_a_skill_entry_or_qualified_form():
+    prose = "I go the extra mile for the rest of the team and excel at C-level reporting."
+    assert keywords({}, prose) == []
+    assert keywords({}, 'Golang services behind RESTful APIs, Spring Boot') == ['go', 'rest', 'spring']
+    assert keywords({'technical_skills': ['Go', 'C', 'Excel']}) == ['c', 'excel', 'go']
+
+
+def test_symbols_in_terms_match_whole_tokens():
+    assert keywords({}, 'C++ and C# on Node.js') == ['c#', 'c++', 'node.js']
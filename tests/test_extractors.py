@@ -0,0 +1,98 @@
+from extractors import HeuristicExtractor, HybridExtractor, find_sections
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 555 010 0199 | github.com/janedoe
+
+Summary
+Backend engineer building payment systems.
+
+Experience
+Acme Corp - Senior Engineer
+- Led the billing rewrite
+
+Education
+BSc Computer Science, State University, 2018
+
+Skills
+Languages: Python, Go, SQL
+Docker | Kubernetes
+"""
+
+
+class FakeLLM:
+    """Records what the hybrid extractor sends and answers with ``response``."""
+    name = 'fake'
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def extract(self, resume_text, links, fields=None):
+        self.calls.append((resume_text, fields))
+        return self.response
+
+
+def test_find_sections_returns_body_ranges_in_order():
+    lines = RESUME.splitlines()
+    sections = find_sections(lines)
+    assert list(sections) == ['professional_summary', 'employment_details', 'education',
+                              'technical_skills']
+    start, end = sections['professional_summary']
+    assert lines[start] == 'Backend engineer building payment systems.'
+    assert lines[start - 1] == 'Summary'
+
+
+def test_heuristic_extracts_contact_summary_and_skills():
+    data = HeuristicExtractor().extract(RESUME, ['https://linkedin.com/in/janedoe'])
+    info = data['personal_info']
+    assert info['full_name'] == 'Jane Doe'
+    assert info['email_id'] == 'jane.doe@example.com'
+    assert info['phone'] == '+1 555 010 0199'
+    assert info['github_portfolio'] == 'github.com/janedoe'
+    assert info['linkedin_id'] == 'https://linkedin.com/in/janedoe'
+    assert data['professional_summary'] == 'Backend engineer building payment systems.'
+    assert data['technical_skills'] == ['Python', 'Go', 'SQL', 'Docker', 'Kubernetes']
+    assert data['employment_details'] == []
+
+
+def test_structured_layout_treats_missing_headings_as_missing_sections():
+    _, unresolved, _, _ = HeuristicExtractor().analyze(RESUME, [])
+    # No soft skills, projects or certifications headings: nothing to ask for
+    assert sorted(unresolved) == ['education', 'employment_details', 'personal_info']
+
+
+def test_unstructured_text_leaves_everything_to_the_llm():
+    _, unresolved, sections, _ = HeuristicExtractor().analyze('Jane Doe\nI write software.', [])
+    assert sections == {}
+    assert {'professional_summary', 'technical_skills', 'soft_skills', 'employment_details',
+            'projects'} <= set(unresolved)
+
+
+def test_hybrid_sends_only_the_header_and_unresolved_sections():
+    llm = FakeLLM({'personal_info': {'full_name': 'Wrong Name', 'location': 'Berlin'},
+                   'employment_details': [{'company': 'Acme Corp'}],
+                   'education': [{'degree': 'BSc'}]})
+    data = HybridExtractor(llm).extract(RESUME, [])
+
+    (context, fields), = llm.calls
+    assert sorted(fields) == ['education', 'employment_details', 'personal_info']
+    assert 'jane.doe@example.com' in context and 'Led the billing rewrite' in context
+    assert 'Backend engineer' not in context and 'Kubernetes' not in context
+    # Heuristic values win; the LLM only fills the gaps
+    assert data['personal_info']['full_name'] == 'Jane Doe'
+    assert data['personal_info']['location'] == 'Berlin'
+    assert data['employment_details'] == [{'company': 'Acme Corp'}]
+    assert data['technical_skills'] == ['Python', 'Go', 'SQL', 'Docker', 'Kubernetes']
+    assert 'partial' not in data
+
+
+def test_hybrid_returns_heuristic_data_when_the_llm_fails():
+    llm = FakeLLM({'error': 'The resume service is busy, please try again shortly',
+                   'retry_after': 5})
+    data = HybridExtractor(llm).extract(RESUME, [])
+
+    assert 'error' not in data
+    assert data['partial']['error'].startswith('The resume service is busy')
+    assert sorted(data['partial']['unresolved']) == ['education', 'employment_details', 'personal_info']
+    assert data['personal_info']['email_id'] == 'jane.doe@example.com'
+    assert data['technical_skills'] == ['Python', 'Go', 'SQL', 'Docker', 'Kubernetes']
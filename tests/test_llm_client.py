@@ -0,0 +1,170 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from llm_client import (LLMClient, AdaptiveLimiter, CircuitBreaker, CircuitOpenError,
+                        DeadlineExceeded)
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeModel:
+    """Answers with the prompt; ``error`` is raised instead while set."""
+
+    def __init__(self, error=None, latency=0.0, gate=None):
+        self.error = error
+        self.latency = latency
+        self.gate = gate
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return Response(prompt)
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return Response(prompt)
+
+
+def open_client(model):
+    """A client with one concurrency slot and a breaker that opens on the first failure."""
+    client = LLMClient(model, max_retries=0,
+                       limiter=AdaptiveLimiter(initial=1, minimum=1, maximum=1),
+                       breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05))
+    with pytest.raises(ConnectionError):
+        client.generate('fail', 'test')
+    assert client.breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    return client
+
+
+def test_breaker_recovers_after_deadline_waiting_for_slot():
+    model = FakeModel(error=ConnectionError('down'))
+    client = open_client(model)
+    client.limiter.acquire(time.monotonic() + 1)  # hold the only slot
+    with pytest.raises(DeadlineExceeded):
+        client.generate('probe', 'test', deadline=0.05)
+    client.limiter.release(0.0, None)
+
+    model.error = None
+    assert client.generate('after', 'test').text == 'after'
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_recovers_after_async_deadline_waiting_for_slot():
+    model = FakeModel(error=ConnectionError('down'))
+    client = open_client(model)
+
+    async def scenario():
+        client.limiter.acquire(time.monotonic() + 1)
+        with pytest.raises(DeadlineExceeded):
+            await client.generate_async('probe', 'test', deadline=0.05)
+        client.limiter.release(0.0, None)
+        model.error = None
+        return await client.generate_async('after', 'test')
+
+    assert asyncio.run(scenario()).text == 'after'
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_recovers_after_probe_is_cancelled():
+    model = FakeModel(error=ConnectionError('down'))
+    client = open_client(model)
+
+    async def scenario():
+        model.error, model.latency = None, 1.0
+        probe = asyncio.ensure_future(client._call_async('probe', 'test', time.monotonic() + 5))
+        await asyncio.sleep(0.05)  # admitted and waiting on the upstream call
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        model.latency = 0.0
+        return await client.generate_async('after', 'test')
+
+    assert asyncio.run(scenario()).text == 'after'
+    assert client.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_breaker_rejects_without_calling_upstream():
+    model = FakeModel(error=ConnectionError('down'))
+    client = LLMClient(model, max_retries=0, breaker=CircuitBreaker(failure_threshold=1))
+    with pytest.raises(ConnectionError):
+        client.generate('a', 'test')
+    with pytest.raises(CircuitOpenError):
+        client.generate('b', 'test')
+    assert model.calls == 1
+
+
+def test_singleflight_shares_errors_with_waiting_callers():
+    gate = threading.Event()
+    model = FakeModel(error=ValueError('bad request'), gate=gate)
+    client = LLMClient(model)
+    errors = []
+
+    def caller():
+        try:
+            client.generate('same prompt', 'test')
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)  # every caller has joined the flight
+    gate.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert model.calls == 1
+    assert len(errors) == 4
+    assert all(error is errors[0] for error in errors)
+
+
+def test_async_singleflight_shares_errors():
+    model = FakeModel(error=ValueError('bad request'), latency=0.05)
+    client = LLMClient(model)
+
+    async def scenario():
+        return await asyncio.gather(*(client.generate_async('same prompt', 'test')
+                                      for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert model.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_limiter_keeps_limit_under_mixed_call_latencies():
+    limiter = AdaptiveLimiter(initial=8, minimum=1, maximum=32)
+    for round_number in range(50):
+        slots = int(limiter.limit)
+        for _ in range(slots):
+            limiter.acquire(time.monotonic() + 1)
+        for slot in range(slots):
+            # Healthy upstream: scoring is normally 5x slower than extraction
+            if slot % 2:
+                limiter.release(0.1, True, 'score')
+            else:
+                limiter.release(0.02, True, 'extract')
+    assert limiter.limit > 8
+
+
+def test_limiter_backs_off_when_a_call_slows_down():
+    limiter = AdaptiveLimiter(initial=8, minimum=1, maximum=32)
+    for latency in (0.02, 0.02, 0.1):
+        limiter.acquire(time.monotonic() + 1)
+        limiter.release(latency, True, 'extract')
+    assert limiter.limit < 8
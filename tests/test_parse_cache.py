@@ -0,0 +1,71 @@
+import parse_cache
+from parse_cache import ParseCache, pdf_digest
+
+
+class Clock:
+    """Stands in for time.time() so TTL and LRU order don't depend on timing."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_round_trip_keyed_by_digest_and_version(tmp_path):
+    cache = ParseCache(tmp_path / 'cache.db')
+    digest = pdf_digest(b'%PDF resume')
+    cache.put(digest, 'v1', {'technical_skills': ['Python']}, 72, {'keywords': {'score': 10}})
+
+    assert cache.get(digest, 'v1') == ({'technical_skills': ['Python']}, 72, {'keywords': {'score': 10}})
+    assert cache.get(digest, 'v2') is None
+    assert cache.get(pdf_digest(b'other'), 'v1') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 1)
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(parse_cache.time, 'time', clock)
+    cache = ParseCache(tmp_path / 'cache.db', ttl=60)
+    cache.put('a' * 64, 'v1', {}, 50)
+
+    clock.now += 59
+    assert cache.get('a' * 64, 'v1') is not None
+    clock.now += 2
+    assert cache.get('a' * 64, 'v1') is None
+
+
+def test_trims_least_recently_used(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(parse_cache.time, 'time', clock)
+    cache = ParseCache(tmp_path / 'cache.db', max_entries=2)
+    for name in ('a', 'b'):
+        clock.now += 1
+        cache.put(name * 64, 'v1', {'name': name}, 50)
+    clock.now += 1
+    cache.get('a' * 64, 'v1')  # b is now the least recently used
+    clock.now += 1
+    cache.put('c' * 64, 'v1', {'name': 'c'}, 50)
+
+    assert cache.get('b' * 64, 'v1') is None
+    assert cache.get('a' * 64, 'v1') and cache.get('c' * 64, 'v1')
+    assert cache.stats()['evictions'] == 1
+
+
+def test_iter_results_skips_errors(tmp_path):
+    cache = ParseCache(tmp_path / 'cache.db')
+    cache.put('a' * 64, 'v1', {'technical_skills': ['Go']}, 60)
+    cache.put('b' * 64, 'v1', {'error': 'Failed to process resume'}, 0)
+
+    assert [digest for digest, _, _ in cache.iter_results()] == ['a' * 64]
+
+
+def test_database_is_opened_on_first_use(tmp_path):
+    path = tmp_path / 'cache.db'
+    cache = ParseCache(path)
+    assert not path.exists()
+    cache.bypass()
+    assert not path.exists()
+    assert cache.stats()['bypassed'] == 1
+    assert path.exists()
@@ -0,0 +1,77 @@
+import os
+
+from render_cache import RenderCache, render_key
+
+
+def compiled_pdf(directory, name, size=100):
+    path = directory / f"{name}.pdf"
+    path.write_bytes(b'%PDF' + b'x' * (size - 4))
+    return path
+
+
+def key(n):
+    return f"{n:064x}"
+
+
+def test_render_key_depends_on_source_and_template_version():
+    assert render_key('tex', 'v1') == render_key('tex', 'v1')
+    assert render_key('tex', 'v1') != render_key('tex', 'v2')
+    assert render_key('tex', 'v1') != render_key('tex2', 'v1')
+
+
+def test_put_moves_pdf_into_cache_and_get_hits(tmp_path):
+    cache = RenderCache(tmp_path / 'cache')
+    built = compiled_pdf(tmp_path, 'build')
+    cached = cache.put(key(1), built)
+
+    assert not built.exists()
+    assert cache.get(key(1)) == cached
+    assert cache.get(key(2)) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries'], stats['bytes']) == (1, 1, 1, 100)
+
+
+def test_evicts_least_recently_used_entry(tmp_path):
+    cache = RenderCache(tmp_path / 'cache', max_entries=2)
+    for n in (1, 2):
+        cache.put(key(n), compiled_pdf(tmp_path, f'build{n}'))
+    cache.get(key(1))  # key 2 is now the oldest
+    cache.put(key(3), compiled_pdf(tmp_path, 'build3'))
+
+    assert cache.get(key(2)) is None
+    assert cache.get(key(1)) and cache.get(key(3))
+    assert cache.stats()['evictions'] == 1
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+
+
+def test_evicts_by_total_size_but_keeps_the_new_entry(tmp_path):
+    cache = RenderCache(tmp_path / 'cache', max_bytes=250)
+    for n in (1, 2, 3):
+        cache.put(key(n), compiled_pdf(tmp_path, f'build{n}'))
+    assert cache.get(key(1)) is None
+    assert cache.stats()['bytes'] == 200
+
+    cache.put(key(4), compiled_pdf(tmp_path, 'big', size=1000))
+    assert cache.get(key(4))
+    assert cache.stats()['entries'] == 1
+
+
+def test_reloads_existing_pdfs_oldest_first(tmp_path):
+    cache = RenderCache(tmp_path / 'cache')
+    for n in (1, 2):
+        path = cache.put(key(n), compiled_pdf(tmp_path, f'build{n}'))
+        os.utime(path, (1000 + n, 1000 + n))
+    (tmp_path / 'cache' / 'not-a-cached-file.pdf').write_bytes(b'%PDF')
+
+    reopened = RenderCache(tmp_path / 'cache', max_entries=1)
+    assert reopened.get(key(1)) is None
+    assert reopened.get(key(2))
+
+
+def test_file_removed_behind_the_cache_is_a_miss(tmp_path):
+    cache = RenderCache(tmp_path / 'cache')
+    os.remove(cache.put(key(1), compiled_pdf(tmp_path, 'build')))
+
+    assert cache.get(key(1)) is None
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['bytes'] == 0
@@ -0,0 +1,86 @@
+from resume_index import ResumeIndex, tokenize, document_terms, FIELDS
+
+
+def resume(name, title, skills, text=''):
+    return {
+        'personal_info': {'full_name': name},
+        'professional_summary': text,
+        'employment_details': [{'company': 'Acme', 'title': title, 'responsibilities': [text]}],
+        'technical_skills': skills,
+    }
+
+
+BACKEND = resume('Ana Backend', 'Backend Engineer', ['Python', 'PostgreSQL', 'Kafka'],
+                 'Built payment services')
+FRONTEND = resume('Ben Frontend', 'Frontend Engineer', ['React', 'TypeScript', 'CSS'],
+                  'Built design systems')
+DATA = resume('Cy Data', 'Data Engineer', ['Python', 'Spark', 'Airflow'], 'Built batch pipelines')
+
+
+def test_tokenize_keeps_symbol_terms_and_drops_stopwords():
+    assert tokenize('Experience with C++, C#, Node.js and CI/CD') == [
+        'experience', 'c++', 'c#', 'node.js', 'ci', 'cd']
+
+
+def test_skills_weigh_more_than_free_text():
+    terms = document_terms(resume('A', 'Engineer', ['Python'], 'python scripts'))
+    weight, mask = terms['python']
+    assert weight == 3.0 + 1.0 + 1.0
+    assert [field for bit, field in enumerate(FIELDS) if mask >> bit & 1] == ['skills', 'text']
+
+
+def test_search_ranks_the_best_match_first(tmp_path):
+    index = ResumeIndex(tmp_path / 'index.db')
+    for n, data in enumerate((BACKEND, FRONTEND, DATA)):
+        index.add(f"{n:064x}", data, ats_score=70, owner='alice')
+
+    results = index.search('Backend engineer: Python, PostgreSQL and Kafka for payments')
+    # Every title contains "engineer"; the skills decide the order
+    assert [r['name'] for r in results] == ['Ana Backend', 'Cy Data', 'Ben Frontend']
+    top = results[0]
+    assert top['headline'] == 'Backend Engineer at Acme'
+    assert top['ats_score'] == 70
+    matched = {m['term']: m['fields'] for m in top['matched_terms']}
+    assert matched['kafka'] == ['skills']
+    assert abs(sum(m['contribution'] for m in top['matched_terms']) - 1) < 0.01
+
+
+def test_search_is_scoped_to_the_owner(tmp_path):
+    index = ResumeIndex(tmp_path / 'index.db')
+    index.add('a' * 64, BACKEND, owner='alice')
+    index.add('b' * 64, DATA, owner='bob')
+
+    assert [r['owner'] for r in index.search('python', owner='bob')] == ['bob']
+    assert len(index.search('python')) == 2
+    assert index.count('alice') == 1
+    assert index.search('') == []
+
+
+def test_add_is_idempotent_and_replaces_changed_data(tmp_path):
+    index = ResumeIndex(tmp_path / 'index.db')
+    assert index.add('a' * 64, BACKEND, owner='alice')
+    assert not index.add('a' * 64, BACKEND, owner='alice')
+    assert index.add('a' * 64, FRONTEND, owner='alice')
+
+    assert len(index) == 1
+    assert index.search('kafka') == []
+    assert index.search('react')[0]['name'] == 'Ben Frontend'
+
+
+def test_reopened_index_and_other_instances_see_added_documents(tmp_path):
+    path = tmp_path / 'index.db'
+    writer = ResumeIndex(path)
+    writer.add('a' * 64, BACKEND, owner='alice')
+    reader = ResumeIndex(path)
+    assert reader.search('kafka')[0]['name'] == 'Ana Backend'
+
+    writer.add('b' * 64, DATA, owner='alice')
+    assert {r['name'] for r in reader.search('python')} == {'Ana Backend', 'Cy Data'}
+
+
+def test_database_is_opened_on_first_use(tmp_path):
+    path = tmp_path / 'index.db'
+    index = ResumeIndex(path)
+    assert not path.exists()
+    assert len(index) == 0
+    assert path.exists()
@@ -0,0 +1,118 @@
+import math
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+
+from instrumentation import span, incr
+
+# Rough characters-per-token ratio used when the API reports no usage
+CHARS_PER_TOKEN = 4
+RECENT_CALLS = 200
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text or '') / CHARS_PER_TOKEN)
+
+
+class TokenLedger:
+    """
+    Per-call record of Gemini usage: input/output tokens (reported by the API
+    when available, otherwise estimated) and request latency.
+    """
+
+    def __init__(self, recent=RECENT_CALLS):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=recent)
+        self._totals = {}
+
+    def record(self, call, input_tokens, output_tokens, latency, estimated, ok=True):
+        entry = {
+            'call': call, 'input_tokens': input_tokens, 'output_tokens': output_tokens,
+            'latency': round(latency, 4), 'estimated': estimated, 'ok': ok, 'time': time.time(),
+        }
+        with self._lock:
+            self._recent.append(entry)
+            totals = self._totals.setdefault(call, {
+                'calls': 0, 'failures': 0, 'input_tokens': 0, 'output_tokens': 0, 'latency': 0.0})
+            totals['calls'] += 1
+            totals['failures'] += 0 if ok else 1
+            totals['input_tokens'] += input_tokens
+            totals['output_tokens'] += output_tokens
+            totals['latency'] += latency
+        logging.debug(f"LLM {call}: {input_tokens} in / {output_tokens} out tokens, {latency:.2f}s")
+        return entry
+
+    def summary(self):
+        """Totals and averages per call name."""
+        with self._lock:
+            result = {}
+            for call, totals in self._totals.items():
+                calls = totals['calls']
+                result[call] = dict(totals,
+                                    avg_input_tokens=totals['input_tokens'] / calls,
+                                    avg_output_tokens=totals['output_tokens'] / calls,
+                                    avg_latency=totals['latency'] / calls)
+            return result
+
+    def recent(self):
+        with self._lock:
+            return list(self._recent)
+
+
+ledger = TokenLedger()
+
+
+def _record_failure(call, prompt, start):
+    ledger.record(call, estimate_tokens(prompt), 0, time.perf_counter() - start,
+                  estimated=True, ok=False)
+    incr('resume_llm_failures_total', call=call, reason='api_error')
+
+
+def _record_response(call, prompt, response, start):
+    latency = time.perf_counter() - start
+    usage = getattr(response, 'usage_metadata', None)
+    input_tokens = getattr(usage, 'prompt_token_count', None)
+    output_tokens = getattr(usage, 'candidates_token_count', None)
+    if input_tokens is None or output_tokens is None:
+        ledger.record(call, estimate_tokens(prompt), estimate_tokens(response.text), latency,
+                      estimated=True)
+    else:
+        ledger.record(call, input_tokens, output_tokens, latency, estimated=False)
+
+
+def generate_with_accounting(model, prompt, call, timeout=None):
+    """
+    Call ``model.generate_content(prompt)`` and record token usage and
+    latency under ``call``. Exceptions are recorded and re-raised.
+    ``timeout`` (seconds) is passed to the API as the request timeout.
+    """
+    options = {'request_options': {'timeout': timeout}} if timeout else {}
+    start = time.perf_counter()
+    try:
+        with span(f'gemini_{call}'):
+            response = model.generate_content(prompt, **options)
+    except Exception:
+        _record_failure(call, prompt, start)
+        raise
+    _record_response(call, prompt, response, start)
+    return response
+
+
+async def generate_with_accounting_async(model, prompt, call, timeout=None):
+    """
+    Async counterpart of generate_with_accounting using ``generate_content_async``;
+    the call is also cancelled locally once ``timeout`` passes.
+    """
+    options = {'request_options': {'timeout': timeout}} if timeout else {}
+    start = time.perf_counter()
+    try:
+        with span(f'gemini_{call}'):
+            response = await asyncio.wait_for(model.generate_content_async(prompt, **options),
+                                              timeout)
+    except Exception:
+        _record_failure(call, prompt, start)
+        raise
+    _record_response(call, prompt, response, start)
+    return response
@@ -0,0 +1,72 @@
+import hashlib
+from tempfile import SpooledTemporaryFile
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# Uploads stay in memory up to this size and spill to a temp file above it
+SPOOL_THRESHOLD = 2 * 1024 * 1024
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MAX_BATCH_UPLOAD_BYTES = 200 * 1024 * 1024
+
+
+class HashingSpooledFile(SpooledTemporaryFile):
+    """
+    Upload buffer that hashes and counts bytes as the form parser writes
+    them, and rejects the request as soon as ``limit`` is exceeded.
+    """
+
+    def __init__(self, limit, max_size=SPOOL_THRESHOLD):
+        super().__init__(max_size=max_size, mode='w+b')
+        self.limit = limit
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.size += len(data)
+        if self.limit is not None and self.size > self.limit:
+            raise RequestEntityTooLarge(f"Upload exceeds {self.limit // (1024 * 1024)} MB")
+        self._sha256.update(data)
+        return super().write(data)
+
+    def hexdigest(self):
+        """SHA-256 of everything written, same as parse_cache.pdf_digest of the bytes."""
+        return self._sha256.hexdigest()
+
+    @property
+    def in_memory(self):
+        return not self._rolled
+
+    def reader(self):
+        """The buffer rewound for reading: the in-memory BytesIO or the spilled temp file."""
+        self.seek(0)
+        return self._file
+
+
+class UploadRequest(Request):
+    """
+    Request class that streams file uploads into HashingSpooledFile buffers.
+
+    MAX_CONTENT_LENGTH caps the whole body (larger Content-Lengths are
+    refused before reading). UPLOAD_LIMITS maps endpoints to a larger cap,
+    e.g. for zip archives.
+    """
+
+    @property
+    def max_content_length(self):
+        if not current_app:
+            return None
+        limits = current_app.config.get('UPLOAD_LIMITS', {})
+        return limits.get(self.endpoint, current_app.config['MAX_CONTENT_LENGTH'])
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None,
+                         content_length=None):
+        return HashingSpooledFile(self.max_content_length)
+
+
+def uploaded_file(file_storage):
+    """The HashingSpooledFile behind a FileStorage from an UploadRequest."""
+    stream = file_storage.stream
+    if not isinstance(stream, HashingSpooledFile):
+        raise TypeError("Upload was not buffered by UploadRequest")
+    return stream
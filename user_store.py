@@ -0,0 +1,91 @@
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+USERS_DB = Path(__file__).parent / 'users.db'
+
+# How long a writer waits for a competing write lock before failing
+BUSY_TIMEOUT_MS = 5000
+
+# Statements are kept constant so sqlite3's per-connection statement cache
+# reuses the prepared form instead of re-parsing SQL on every request.
+SELECT_PASSWORD = "SELECT password FROM users WHERE username = ?"
+SELECT_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+INSERT_USER = "INSERT INTO users (username, password) VALUES (?, ?)"
+UPDATE_PASSWORD = "UPDATE users SET password = ? WHERE username = ?"
+
+
+class UserStore:
+    """
+    Access to the users table through one pooled connection per thread.
+
+    Once ``migrate`` has run, the database is in WAL mode so logins (reads)
+    never block on signups or password resets (writes), and ``username`` is
+    backed by a unique index, which makes lookups O(log n) and signup a
+    single atomic insert.
+    """
+
+    def __init__(self, path=USERS_DB):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000,
+                                   cached_statements=32)
+            conn.execute(f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}')
+            # Safe with WAL: a crash can lose the last commit but never corrupts
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def migrate(self):
+        """
+        Create the schema, switch to WAL and add the unique username index.
+        Run once at start-up (app.init_db), never on import.
+        """
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS users
+                            (id INTEGER PRIMARY KEY, username TEXT, password TEXT)''')
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list('users')")}
+            if 'idx_users_username' not in indexes:
+                # Older databases may hold duplicates from the signup race. Logins
+                # always matched the first row, so later copies are unreachable.
+                removed = conn.execute('''DELETE FROM users WHERE id NOT IN
+                                          (SELECT MIN(id) FROM users GROUP BY username)''').rowcount
+                if removed:
+                    logging.warning(f"Removed {removed} duplicate user rows before indexing")
+                conn.execute('CREATE UNIQUE INDEX idx_users_username ON users (username)')
+
+    def get_password_hash(self, username):
+        row = self._connection().execute(SELECT_PASSWORD, (username,)).fetchone()
+        return row[0] if row else None
+
+    def exists(self, username):
+        return self._connection().execute(SELECT_EXISTS, (username,)).fetchone() is not None
+
+    def create_user(self, username, password_hash):
+        """Insert a user; returns False if the username is already taken."""
+        conn = self._connection()
+        try:
+            with conn:
+                conn.execute(INSERT_USER, (username, password_hash))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def set_password(self, username, password_hash):
+        """Returns True if a user with ``username`` was updated."""
+        conn = self._connection()
+        with conn:
+            return conn.execute(UPDATE_PASSWORD, (password_hash, username)).rowcount > 0
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,23 @@
+import multiprocessing
+
+# Modules whose functions run in pool workers; the fork server imports them
+# once so each new worker starts warm
+WORKER_MODULES = ['build_jobs', 'pdf_extraction']
+
+
+def worker_context():
+    """
+    Start method for the process pools. Workers come from a forkserver (spawn
+    where that isn't available) instead of a fork of the multithreaded web
+    process, so a lock held by another request thread is never copied into a
+    child. Only WORKER_MODULES are preloaded, not ``__main__``.
+
+    Every worker still runs the entry script as ``__mp_main__`` when it
+    starts, so app.py must stay free of import-time side effects: no
+    background threads, migrations or database opens.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(WORKER_MODULES)
+    return context